@@ -2,16 +2,12 @@
 Base Agent Class.
 """
 from abc import ABC, abstractmethod
-import threading
 import time
-import json
-import os
 from datetime import datetime
 from typing import Dict, Any
 from utils.logger import get_logger
 from agents.message_bus import bus
-
-STATUS_FILE = "data/agent_status.json"
+from agents import status_store
 
 
 class BaseAgent(ABC):
@@ -20,7 +16,13 @@ class BaseAgent(ABC):
         self.interval = interval # Loop interval in seconds
         self.logger = get_logger(f"Agent.{name}")
         self.running = False
-        self.thread = None
+        # Set by the orchestrator so _reset_idle() can pull the next run forward
+        self._on_reschedule = None
+        # Back off when perform_task reports nothing changed; real events snap back.
+        self._idle_ladder = [interval, interval * 2, interval * 6, interval * 12, interval * 36]
+        self._idle_idx = 0
+        # Wall-clock time of the current tick, for perform_task to stamp messages with
+        self._last_tick_iso = None
         self._setup_subscriptions()
 
     def _setup_subscriptions(self):
@@ -28,68 +30,76 @@ class BaseAgent(ABC):
         pass
 
     
-    def _update_status_file(self, state: str, details: Dict = None):
-        """Update the agent's status in the shared JSON file."""
-        try:
-            if not os.path.exists('data'):
-                os.makedirs('data')
-                
-            data = {}
-            if os.path.exists(STATUS_FILE):
-                try:
-                    with open(STATUS_FILE, 'r') as f:
-                        data = json.load(f)
-                except:
-                    data = {}
-            
-            data[self.name] = {
-                "state": state,
-                "last_heartbeat": datetime.now().isoformat(),
-                "interval": self.interval,
-                "details": details or {}
-            }
-            
-            with open(STATUS_FILE, 'w') as f:
-                json.dump(data, f, indent=4)
-        except Exception as e:
-            self.logger.error(f"Failed to update status file: {e}")
+    def _update_status_file(self, state: str, details: Dict = None, ts: float = None):
+        """Record the agent's status; the status store flushes it to disk."""
+        status_store.update(self.name, state, self.interval, details, ts=ts)
+
+    def _build_details(self) -> Dict:
+        """Override to attach agent-specific details to each heartbeat."""
+        return {}
+
+    def _next_interval(self, changed) -> int:
+        """Advance or reset the idle ladder based on perform_task's result."""
+        if changed is False:
+            self._idle_idx = min(self._idle_idx + 1, len(self._idle_ladder) - 1)
+        else:
+            self._idle_idx = 0
+        return self._idle_ladder[self._idle_idx]
+
+    def _reset_idle(self):
+        """Step back towards the fast cadence after a real event.
+
+        Halves the ladder position instead of zeroing it so a burst of events
+        doesn't reset every agent at once.
+        """
+        self._idle_idx //= 2
+        if self._on_reschedule:
+            self._on_reschedule(self)
+
+    @property
+    def current_interval(self) -> int:
+        """Delay until the next run at the current ladder position."""
+        return self._idle_ladder[self._idle_idx]
 
     def start(self):
-        """Start the agent's main loop."""
+        """Mark the agent as running. The orchestrator schedules run_once()."""
         if self.running:
             return
         
         self.running = True
-        self.thread = threading.Thread(target=self._run_loop, daemon=True)
-        self.thread.start()
+        status_store.start_flusher()
         self._update_status_file("running", {"started_at": datetime.now().isoformat()})
-        self.logger.info(f"{self.name} started.")
+        self.logger.info("%s started.", self.name)
         self.on_start()
 
     def stop(self):
         """Stop the agent."""
         self.running = False
-        if self.thread:
-            self.thread.join(timeout=2)
         self._update_status_file("stopped", {"stopped_at": datetime.now().isoformat()})
-        self.logger.info(f"{self.name} stopped.")
+        status_store.flush()
+        self.logger.info("%s stopped.", self.name)
         self.on_stop()
 
-    def _run_loop(self):
-        """Internal loop runner."""
-        while self.running:
-            try:
-                self._update_status_file("active") # Heartbeat
-                self.perform_task()
-            except Exception as e:
-                self.logger.error(f"Error in {self.name} loop: {e}")
-                self._update_status_file("error", {"last_error": str(e)})
-            
-            time.sleep(self.interval)
+    def run_once(self) -> int:
+        """Heartbeat and perform one task. Returns the delay until the next run."""
+        changed = None
+        tick = time.monotonic()
+        self._last_tick_iso = datetime.now().isoformat()
+        try:
+            self._update_status_file("active", self._build_details(), ts=tick) # Heartbeat
+            changed = self.perform_task()
+        except Exception as e:
+            self.logger.error("Error in %s loop: %s", self.name, e)
+            self._update_status_file("error", {"last_error": str(e)}, ts=tick)
+        return self._next_interval(changed)
 
     @abstractmethod
     def perform_task(self):
-        """Main autonomous task to run periodically."""
+        """Main autonomous task to run periodically.
+
+        Return False when nothing changed to let the agent back off; any other
+        value keeps the base interval.
+        """
         pass
 
     def on_start(self):
@@ -101,5 +111,6 @@ class BaseAgent(ABC):
     def publish(self, topic: str, message: Any):
         bus.publish(topic, message)
 
-    def subscribe(self, topic: str, handler):
-        bus.subscribe(topic, handler)
+    def subscribe(self, topic: str, handler, **options):
+        """Subscribe to a topic; options (sync, heavy, timeout) go to the bus."""
+        bus.subscribe(topic, handler, **options)
@@ -19,12 +19,13 @@ class DataAgent(BaseAgent):
             # In a more granular agent, we might check first, then publish "DataNeeded" event.
             # For now, we run the pipeline directly.
             
-            run_pipeline()
+            changed = run_pipeline()
             
-            self.publish("data_check_complete", {"status": "success"})
+            self.publish("data_check_complete", {"status": "success", "changed": changed})
+            return changed
             
         except Exception as e:
-            self.logger.error(f"Data pipeline execution failed: {e}")
+            self.logger.error("Data pipeline execution failed: %s", e)
             self.publish("data_check_failed", {"error": str(e)})
 
     def on_start(self):
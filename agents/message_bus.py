@@ -1,35 +1,143 @@
 """
 Simple In-Memory Message Bus for Agent Communication.
 """
-from typing import Dict, List, Any, Callable
-from collections import defaultdict
+import json
+import threading
+import time
+from typing import Dict, List, Any, Callable, Tuple
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from utils.logger import get_logger
 
 logger = get_logger("MessageBus")
 
+HANDLER_TIMEOUT = 30.0  # seconds a pooled handler may take before it's flagged
+MAX_TRACKED = 256       # Bound on in-flight handlers the reaper keeps track of
+COALESCE_WINDOW = 5.0   # seconds within which an identical topic+payload is dropped
+
 class MessageBus:
-    _instance = None
-    
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(MessageBus, cls).__new__(cls)
-            cls._instance.subscribers = defaultdict(list)
-        return cls._instance
-
-    def subscribe(self, topic: str, handler: Callable):
-        """Subscribe a handler function to a topic."""
-        self.subscribers[topic].append(handler)
-        logger.debug(f"Subscribed to {topic}")
+    """Topic-based pub/sub. Use the module-level `bus` instance."""
+
+    def __init__(self):
+        self.subscribers = defaultdict(list)
+        self._frozen = False
+        self._last_event: Dict[str, Tuple[float, str]] = {}
+        self._last_event_lock = threading.Lock()
+        # Handlers run off the publisher's thread so a slow subscriber
+        # doesn't stall the publishing agent. Long jobs (retraining) get
+        # their own pool so they can't pin the shared workers.
+        self._pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="bus")
+        self._heavy_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bus-heavy")
+        self._inflight = deque(maxlen=MAX_TRACKED)
+        self._inflight_lock = threading.Lock()
+        self._inflight_added = threading.Condition(self._inflight_lock)
+        # Started on demand and exits once nothing is tracked, so an idle process has no timer thread
+        self._reaper = None
+
+    def subscribe(self, topic: str, handler: Callable, sync: bool = False,
+                  heavy: bool = False, timeout: float = HANDLER_TIMEOUT):
+        """Subscribe a handler function to a topic.
+
+        Handlers run on the bus worker pool within `timeout` seconds. Use
+        sync=True to run inline on the publisher's thread, or heavy=True for
+        long-running work, which goes to a dedicated pool with no timeout.
+        """
+        if self._frozen:
+            raise RuntimeError(f"Cannot subscribe to {topic}: message bus is frozen")
+        if sync:
+            pool, timeout = None, None
+        elif heavy:
+            pool, timeout = self._heavy_pool, None
+        else:
+            pool = self._pool
+        self.subscribers[topic].append((handler, pool, timeout))
+        logger.debug("Subscribed to %s", topic)
+
+    def freeze(self):
+        """Lock the topic table once setup is done.
+
+        Subscriptions are made while agents are constructed, so after startup
+        the table is read-only and publish() can iterate immutable tuples
+        without racing subscribe().
+        """
+        self.subscribers: Dict[str, Tuple] = {
+            topic: tuple(handlers) for topic, handlers in self.subscribers.items()
+        }
+        self._frozen = True
+
+    def _run_handler(self, topic: str, handler: Callable, message: Any):
+        try:
+            handler(message)
+        except Exception as e:
+            logger.error("Error handling message on %s: %s", topic, e)
+
+    def _track(self, future, deadline: float, topic: str, handler: Callable):
+        """Hand a pooled handler's future to the reaper, starting it if it isn't running."""
+        with self._inflight_lock:
+            self._inflight.append((future, deadline, topic, handler))
+            if self._reaper is None:
+                self._reaper = threading.Thread(target=self._reap, name="bus-reaper", daemon=True)
+                self._reaper.start()
+            else:
+                self._inflight_added.notify()
+
+    def _reap(self):
+        """Cancel handlers that are still queued past their deadline.
+
+        Python threads can't be interrupted, so a handler that is already
+        running is only reported; it stops being tracked either way. Sleeps
+        until the earliest deadline and exits once nothing is left to track.
+        """
+        with self._inflight_lock:
+            while self._inflight:
+                now = time.monotonic()
+                pending = list(self._inflight)
+                self._inflight.clear()
+                for entry in pending:
+                    future, deadline, topic, handler = entry
+                    if future.done():
+                        continue
+                    if now < deadline:
+                        self._inflight.append(entry)
+                        continue
+                    name = getattr(handler, "__qualname__", repr(handler))
+                    if future.cancel():
+                        logger.warning("Dropped %s on %s: not started within timeout", name, topic)
+                    else:
+                        logger.warning("Handler %s on %s exceeded its timeout", name, topic)
+                if self._inflight:
+                    next_deadline = min(entry[1] for entry in self._inflight)
+                    self._inflight_added.wait(max(next_deadline - now, 0.0))
+            self._reaper = None
+
+    def _is_duplicate(self, topic: str, message: Any) -> bool:
+        """True if the same payload went out on this topic within COALESCE_WINDOW."""
+        key = json.dumps(message, sort_keys=True, default=str)
+        now = time.monotonic()
+        with self._last_event_lock:
+            last = self._last_event.get(topic)
+            if last is not None and last[1] == key and now - last[0] < COALESCE_WINDOW:
+                return True
+            self._last_event[topic] = (now, key)
+        return False
 
     def publish(self, topic: str, message: Any):
-        """Publish a message to a topic."""
-        logger.debug(f"Publishing to {topic}: {message}")
-        if topic in self.subscribers:
-            for handler in self.subscribers[topic]:
-                try:
-                    handler(message)
-                except Exception as e:
-                    logger.error(f"Error handling message on {topic}: {e}")
+        """Publish a message to a topic.
+
+        Bursts of identical messages (same topic and payload) are coalesced so
+        e.g. repeated data_check_complete events don't retrigger retraining.
+        """
+        if self._is_duplicate(topic, message):
+            logger.debug("Coalesced duplicate message on %s", topic)
+            return
+        logger.debug("Publishing to %s: %s", topic, message)
+        for handler, pool, timeout in self.subscribers.get(topic, ()):
+            if pool is None:
+                self._run_handler(topic, handler, message)
+                continue
+            future = pool.submit(self._run_handler, topic, handler, message)
+            if timeout is not None:
+                self._track(future, time.monotonic() + timeout, topic, handler)
 
 # Global instance
 bus = MessageBus()
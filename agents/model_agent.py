@@ -2,12 +2,14 @@
 Model Agent.
 Monitors model health, registry status, and triggers retraining.
 """
-from datetime import datetime, timedelta
-import dateutil.parser
+import time
 from agents.base import BaseAgent
 from models.registry import ModelRegistry
 from pipelines.orchestrator import run_pipeline
 
+MS_PER_DAY = 86_400_000
+FRESHNESS_CHECK_TIMEOUT = 30.0  # seconds; the registry lookup should never take longer
+
 class ModelAgent(BaseAgent):
     def __init__(self, interval=86400): # Check daily by default
         super().__init__(name="ModelAgent", interval=interval)
@@ -15,7 +17,10 @@ class ModelAgent(BaseAgent):
         self.max_model_age_days = 7
 
     def _setup_subscriptions(self):
-        self.subscribe("data_check_complete", self.on_data_update)
+        # The freshness check is a quick registry lookup on the shared pool. Retraining
+        # can run for minutes, so it's requested on "retrain" and kept off that pool.
+        self.subscribe("data_check_complete", self.on_data_update, timeout=FRESHNESS_CHECK_TIMEOUT)
+        self.subscribe("retrain", self.on_retrain, heavy=True)
 
     def perform_task(self):
         """Periodic check for model freshness."""
@@ -25,39 +30,43 @@ class ModelAgent(BaseAgent):
     def on_data_update(self, message):
         """Handle data update event."""
         if message.get("status") == "success":
+            self._reset_idle()
             self.logger.info("Data update received. Checking if retraining is needed...")
             # Ideally, we check drift here. For now, we trust the pipeline or enforce freshness.
             self.check_model_freshness(force=True)
 
+    def on_retrain(self, message):
+        """Run the training pipeline (heavy pool) and announce it."""
+        run_pipeline()
+        self.publish("retraining_triggered", message)
+
     def check_model_freshness(self, force=False):
-        """Check if production model is too old."""
+        """Check if production model is too old; request retraining if so."""
         try:
             # Check existense and metadata
             metadata = self.registry.get_model_metadata("HybridRanker", stage="Production")
             
             if not metadata and not force:
                 self.logger.warning("No Production model found! Triggering training.")
-                run_pipeline()
-                self.publish("retraining_triggered", {"reason": "missing_model"})
+                self.publish("retrain", {"reason": "missing_model"})
                 return
 
             # Check age
             if metadata:
-                creation_time = datetime.fromtimestamp(metadata.creation_timestamp / 1000)
-                age = datetime.now() - creation_time
-                self.logger.info(f"Model age: {age.days} days (Created: {creation_time})")
+                # MLflow timestamps are epoch milliseconds; stay in integer ms
+                age_days = (int(time.time() * 1000) - metadata.creation_timestamp) // MS_PER_DAY
+                self.logger.info("Model age: %d days (Version: %s)", age_days, metadata.version)
 
-                if age.days > self.max_model_age_days or force:
+                if age_days > self.max_model_age_days or force:
                     self.logger.info("Model is too old or force update requested. Triggering pipeline...")
-                    run_pipeline()
-                    self.publish("retraining_triggered", {"reason": "model_stale", "age_days": age.days})
+                    self.publish("retrain", {"reason": "model_stale", "age_days": age_days})
                     return
 
             self.logger.info("Model health check passed.")
             self.publish("model_health_check", {"status": "healthy"})
 
         except Exception as e:
-            self.logger.error(f"Model health check failed: {e}")
+            self.logger.error("Model health check failed: %s", e)
             self.publish("model_health_check", {"status": "error", "error": str(e)})
 
     def on_start(self):
@@ -2,63 +2,143 @@
 Agent Orchestrator.
 Manages the lifecycle of all AI agents.
 """
+import sched
 import time
 import signal
 import sys
-from typing import List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
 from agents.base import BaseAgent
+from agents.message_bus import bus
 from utils.logger import get_logger
 
 logger = get_logger("AgentOrchestrator")
 
 class AgentOrchestrator:
-    def __init__(self):
+    def __init__(self, max_workers: int = 4):
         self.agents: List[BaseAgent] = []
         self.running = False
+        # One scheduler thread plus a small worker pool, regardless of agent count
+        self._stop_event = threading.Event()
+        self._shutdown = threading.Event()  # Set by signal handlers to end start_all()
+        self._wake_event = threading.Event()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="agent")
+        self._sched = sched.scheduler(time.monotonic, self._delay)
+        self._sched_thread = None
+        self._lock = threading.Lock()
+        self._pending: Dict[str, sched.Event] = {}  # Agent name -> queued run
+        self._last_tick: Dict[str, float] = {}      # Agent name -> last scheduled run time
 
     def register_agent(self, agent: BaseAgent):
         self.agents.append(agent)
-        logger.info(f"Registered agent: {agent.name}")
+        agent._on_reschedule = self.reschedule
+        logger.info("Registered agent: %s", agent.name)
+
+    def _delay(self, timeout):
+        """Scheduler sleep that schedule()/stop_all() can cut short."""
+        if self._wake_event.wait(timeout):
+            self._wake_event.clear()
+
+    def _run_scheduler(self):
+        while not self._stop_event.is_set():
+            self._sched.run()
+            # Queue is empty while every agent is mid-task; wait for a reschedule
+            self._delay(None)
+
+    def schedule(self, agent: BaseAgent, at: float = None):
+        """Queue the agent's next run at monotonic time `at` (default: now)."""
+        if at is None:
+            at = time.monotonic()
+        with self._lock:
+            self._pending[agent.name] = self._sched.enterabs(at, 1, self._dispatch, (agent, at))
+        self._wake_event.set()
+
+    def reschedule(self, agent: BaseAgent):
+        """Re-plan a queued run after the agent's interval changed."""
+        with self._lock:
+            last_tick = self._last_tick.get(agent.name)
+            if last_tick is None:
+                return  # First run is still queued at its original time
+            event = self._pending.pop(agent.name, None)
+            if event is None:
+                return  # Mid-task: the new interval applies when it finishes
+            try:
+                self._sched.cancel(event)
+            except ValueError:
+                return  # Already dispatched
+            at = max(last_tick + agent.current_interval, time.monotonic())
+        self.schedule(agent, at)
+
+    def _dispatch(self, agent: BaseAgent, tick: float):
+        if self._stop_event.is_set():
+            return
+        with self._lock:
+            self._pending.pop(agent.name, None)
+            self._last_tick[agent.name] = tick
+        future = self._pool.submit(agent.run_once)
+        future.add_done_callback(lambda f: self._on_done(agent, tick, f))
+
+    def _on_done(self, agent: BaseAgent, tick: float, future):
+        if self._stop_event.is_set() or not agent.running:
+            return
+        # Schedule from the planned tick so task time doesn't accumulate drift;
+        # overran ticks are skipped rather than replayed back-to-back.
+        self.schedule(agent, max(tick + future.result(), time.monotonic()))
 
     def start_all(self):
         logger.info("Starting all agents...")
         self.running = True
+        self._stop_event.clear()
         for agent in self.agents:
             agent.start()
+            self.schedule(agent)
+        self._sched_thread = threading.Thread(target=self._run_scheduler, name="agent-scheduler", daemon=True)
+        self._sched_thread.start()
+        # All subscriptions are made in agent constructors; lock the table now
+        bus.freeze()
             
         # Register signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self._handle_signal)
         signal.signal(signal.SIGTERM, self._handle_signal)
         
-        # Keep main thread alive
-        try:
-            while self.running:
-                time.sleep(1)
-        except KeyboardInterrupt:
-            self.stop_all()
+        # Block the main thread until a signal asks us to shut down
+        self._shutdown.wait()
+        self.stop_all()
 
     def stop_all(self):
         logger.info("Stopping all agents...")
         self.running = False
+        self._stop_event.set()
+        with self._lock:
+            for event in self._sched.queue:
+                self._sched.cancel(event)
+            self._pending.clear()
+        self._wake_event.set()
+        self._pool.shutdown(wait=False, cancel_futures=True)
         for agent in self.agents:
             agent.stop()
         logger.info("System shutdown complete.")
         sys.exit(0)
 
     def _handle_signal(self, signum, frame):
-        logger.info(f"Received signal {signum}")
-        self.stop_all()
+        logger.info("Received signal %s", signum)
+        # Don't tear down from signal context; start_all() does it on wake
+        self._shutdown.set()
 
 if __name__ == "__main__":
-    from agents.data_agent import DataAgent
-    from agents.model_agent import ModelAgent
-    from agents.strategy_agent import StrategyAgent
+    import importlib
+
+    # Agent modules pull in the pipeline, MLflow and the LLM SDK; overlap their imports
+    agent_modules = ["agents.data_agent", "agents.model_agent", "agents.strategy_agent"]
+    with ThreadPoolExecutor(max_workers=len(agent_modules)) as pool:
+        data_mod, model_mod, strategy_mod = pool.map(importlib.import_module, agent_modules)
 
     orch = AgentOrchestrator()
     
     # Register Agents
-    orch.register_agent(DataAgent())     # Interval: 1h
-    orch.register_agent(ModelAgent())    # Interval: 24h
-    orch.register_agent(StrategyAgent()) # Interval: 10m
+    orch.register_agent(data_mod.DataAgent())         # Interval: 1h
+    orch.register_agent(model_mod.ModelAgent())       # Interval: 24h
+    orch.register_agent(strategy_mod.StrategyAgent()) # Interval: 10m
     
     orch.start_all()
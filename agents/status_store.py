@@ -0,0 +1,164 @@
+"""
+Agent Status Store.
+Process-wide in-memory aggregation of agent heartbeats, flushed to disk periodically.
+Each agent gets its own file under STATUS_DIR, so writers never share a file.
+"""
+import glob
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Any
+from utils.logger import get_logger
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = get_logger("StatusStore")
+
+STATUS_DIR = "data/agent_status"
+FLUSH_INTERVAL = 1.0  # seconds
+HEARTBEAT_WRITE_EVERY = 5  # Heartbeat-only updates to batch before rewriting a file
+
+# Offset used to turn monotonic heartbeats into wall-clock time at flush.
+_EPOCH_OFFSET = time.time() - time.monotonic()
+
+_STATE: Dict[str, Dict[str, Any]] = {}
+_LOCK = threading.Lock()
+_FLUSH_LOCK = threading.Lock()  # flock is per-process, so serialize our own threads too
+_flusher = None
+_lock_fd = None
+_dirty = set()                      # Agents whose state/interval/details changed
+_pending_beats: Dict[str, int] = {}  # Agent -> heartbeat-only updates since its last write
+
+
+def update(name: str, state: str, interval: int, details: Dict = None, ts: float = None):
+    """Record an agent's status. Cheap enough to call on every heartbeat.
+
+    ts is a time.monotonic() reading; defaults to now.
+    """
+    if ts is None:
+        ts = time.monotonic()
+    details = details or {}
+    with _LOCK:
+        prev = _STATE.get(name)
+        if (prev is not None and prev["state"] == state
+                and prev["interval"] == interval and prev["details"] == details):
+            _pending_beats[name] = _pending_beats.get(name, 0) + 1
+        else:
+            _dirty.add(name)
+        _STATE[name] = {
+            "state": state,
+            "last_heartbeat": ts,
+            "interval": interval,
+            "details": details
+        }
+
+
+def _dumps(obj) -> bytes:
+    """Compact JSON bytes, via orjson when it's installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def _is_due(name: str) -> bool:
+    return name in _dirty or _pending_beats.get(name, 0) >= HEARTBEAT_WRITE_EVERY
+
+
+def _take_snapshot(due_only: bool) -> Dict[str, bytes]:
+    """Serialized entries to write, keyed by agent name. Clears their change flags."""
+    with _LOCK:
+        names = [name for name in _STATE if not due_only or _is_due(name)]
+        snapshot = {name: dict(_STATE[name]) for name in names}
+        for name in names:
+            _dirty.discard(name)
+            _pending_beats.pop(name, None)
+    payloads = {}
+    for name, entry in snapshot.items():
+        entry["last_heartbeat"] = datetime.fromtimestamp(
+            entry["last_heartbeat"] + _EPOCH_OFFSET
+        ).isoformat()
+        payloads[name] = _dumps(entry)
+    return payloads
+
+
+@contextmanager
+def _file_lock():
+    """Exclusive lock on a sidecar file so other processes never see a half-swap."""
+    global _lock_fd
+    if _lock_fd is None:
+        os.makedirs(STATUS_DIR, exist_ok=True)
+        _lock_fd = os.open(os.path.join(STATUS_DIR, ".lock"), os.O_RDWR | os.O_CREAT)
+    if fcntl:
+        fcntl.flock(_lock_fd, fcntl.LOCK_EX)
+    else:
+        os.lseek(_lock_fd, 0, os.SEEK_SET)
+        msvcrt.locking(_lock_fd, msvcrt.LK_LOCK, 1)
+    try:
+        yield
+    finally:
+        if fcntl:
+            fcntl.flock(_lock_fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(_lock_fd, 0, os.SEEK_SET)
+            msvcrt.locking(_lock_fd, msvcrt.LK_UNLCK, 1)
+
+
+def flush(due_only: bool = False):
+    """Write agent status files atomically (all agents unless due_only)."""
+    try:
+        with _FLUSH_LOCK:
+            payloads = _take_snapshot(due_only)
+            if not payloads:
+                return
+            with _file_lock():
+                for name, payload in payloads.items():
+                    path = os.path.join(STATUS_DIR, f"{name}.json")
+                    tmp_path = path + ".tmp"
+                    with open(tmp_path, 'wb') as f:
+                        f.write(payload)
+                    os.replace(tmp_path, path)
+    except Exception as e:
+        logger.error("Failed to flush status files: %s", e)
+
+
+def load_all_statuses() -> Dict[str, Dict[str, Any]]:
+    """Read every agent's last flushed status, keyed by agent name (for dashboards)."""
+    statuses = {}
+    for path in glob.glob(os.path.join(STATUS_DIR, "*.json")):
+        name = os.path.splitext(os.path.basename(path))[0]
+        try:
+            with open(path, 'rb') as f:
+                raw = f.read()
+            statuses[name] = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        except Exception as e:
+            logger.warning("Could not read status for %s: %s", name, e)
+    return statuses
+
+
+def _flush_loop():
+    while True:
+        time.sleep(FLUSH_INTERVAL)
+        # Only rewrite for real changes, or every few heartbeats otherwise
+        flush(due_only=True)
+
+
+def start_flusher():
+    """Start the background flusher thread (idempotent)."""
+    global _flusher
+    with _LOCK:
+        if _flusher is not None and _flusher.is_alive():
+            return
+        _flusher = threading.Thread(target=_flush_loop, name="status-flusher", daemon=True)
+        _flusher.start()
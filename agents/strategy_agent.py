@@ -2,16 +2,32 @@
 Strategy Agent.
 Proactive agent that monitors race weekends and generates AI strategy insights.
 """
-from datetime import datetime, timedelta
 from agents.base import BaseAgent
-from utils.ai import RaceEngineer
-from utils.race_utils import get_schedule_with_fallback
+from utils.ai import RaceEngineer, build_insight_prompt, get_ai_insight_from_prompt
 import pytz
 
 class StrategyAgent(BaseAgent):
     def __init__(self, interval=600): # Check every 10 minutes
         super().__init__(name="StrategyAgent", interval=interval)
         self.engineer = RaceEngineer()
+        self._latest_insight = None
+        # The outlook question never changes, so render the prompt once
+        self._strategy_prompt = build_insight_prompt(
+            "Provide a strategic outlook for the current/next F1 race weekend."
+        )
+
+    def _build_details(self):
+        if self._latest_insight:
+            return {"latest_insight": self._latest_insight[:100] + "..."}
+        return {}
+
+    def _setup_subscriptions(self):
+        self.subscribe("data_check_complete", self.on_data_update)
+
+    def on_data_update(self, message):
+        """New race data makes a fresh outlook worthwhile; return to the fast cadence."""
+        if message.get("changed"):
+            self._reset_idle()
 
     def perform_task(self):
         self.logger.info("Analyzing race calendar for strategic insights...")
@@ -19,36 +35,41 @@ class StrategyAgent(BaseAgent):
         # Check if we are in a race weekend
         # Simplified logic: Get next race
         try:
-            current_date = datetime.now()
             # This is a heuristic. In production we'd use robust schedule checking
             
             # For demonstration, we just generate a general insight about the "Next" race
             # We assume the AI Engineer can handle general queries
             
-            insight = self.engineer.get_ai_insight("Provide a strategic outlook for the current/next F1 race weekend.")
+            insight = get_ai_insight_from_prompt(self._strategy_prompt)
+            
+            if not insight:
+                # AI unconfigured or the request failed; nothing worth publishing
+                self.logger.warning("No strategic insight generated.")
+                return False
+            
+            self.logger.info("Generated new strategic insight.")
+            # We could save this to DB or publish
+            self.publish("strategy_insight", {"content": insight, "timestamp": self._last_tick_iso})
             
-            if insight:
-                self.logger.info("Generated new strategic insight.")
-                # We could save this to DB or publish
-                self.publish("strategy_insight", {"content": insight, "timestamp": datetime.now().isoformat()})
-                
-                # Update status details with latest insight
-                self._update_status_file("active", {"latest_insight": insight[:100] + "..."})
+            # Surfaced in the status details by the next heartbeat
+            self._latest_insight = insight
+            return True
             
         except Exception as e:
-            self.logger.error(f"Strategy analysis failed: {e}")
+            self.logger.error("Strategy analysis failed: %s", e)
+            return False
 
     def chat(self, user_message):
         """
         Direct chat interface for the Strategy Agent.
         Delegates to RaceEngineer with Strategy Agent's context.
         """
-        self.logger.info(f"Received chat message: {user_message}")
+        self.logger.info("Received chat message: %s", user_message)
         try:
             response = self.engineer.ask(user_message)
             return response
         except Exception as e:
-            self.logger.error(f"Chat failed: {e}")
+            self.logger.error("Chat failed: %s", e)
             return "I'm having trouble connecting to the pit wall. Please try again."
 
     def analyze_session_commentary(self, commentary_text):
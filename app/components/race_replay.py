@@ -6,7 +6,13 @@ Provides leaderboard, playback controls, telemetry panels, and weather widgets.
 """
 
 import streamlit as st
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
 from typing import Dict, List, Optional, Callable, Tuple
+import bisect
+from collections import OrderedDict
+import functools
 import math
 
 
@@ -14,10 +20,14 @@ def format_time(seconds: float) -> str:
     """Format seconds to HH:MM:SS or MM:SS."""
     if seconds is None or math.isnan(seconds):
         return "--:--"
-    
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
+    return _format_whole_seconds(math.floor(seconds))
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_whole_seconds(total: int) -> str:
+    hours = total // 3600
+    minutes = (total % 3600) // 60
+    secs = total % 60
     
     if hours > 0:
         return f"{hours:02d}:{minutes:02d}:{secs:02d}"
@@ -30,33 +40,38 @@ def format_gap(gap_seconds: float) -> str:
         return "LEADER"
     if math.isnan(gap_seconds):
         return "--"
+    return _format_gap_tenths(round(gap_seconds, 1))
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_gap_tenths(gap_seconds: float) -> str:
     return f"+{gap_seconds:.1f}s"
 
 
+LEADERBOARD_HEIGHT = 420  # px; the table windows its rows past this height
+
+# Indexed by tyre compound int: 0 UNKNOWN, 1 SOFT, 2 MEDIUM, 3 HARD, 4 INTERMEDIATE, 5 WET
+_TYRE_EMOJI: Tuple[str, ...] = ("⚫", "🔴", "🟡", "⚪", "🟢", "🔵")
+_TYRE_NAME: Tuple[str, ...] = ("N/A", "SOFT", "MEDIUM", "HARD", "INTER", "WET")
+
+
+def _tyre_index(tyre_int) -> int:
+    """Index into the tyre tables; 0 (unknown) for None, NaN or anything not a known compound."""
+    try:
+        i = int(tyre_int)
+    except (TypeError, ValueError, OverflowError):
+        return 0
+    return i if i == tyre_int and 0 <= i < len(_TYRE_NAME) else 0
+
+
 def get_tyre_emoji(tyre_int: int) -> str:
     """Get emoji for tyre compound."""
-    tyres = {
-        1: "🔴",  # SOFT
-        2: "🟡",  # MEDIUM  
-        3: "⚪",  # HARD
-        4: "🟢",  # INTERMEDIATE
-        5: "🔵",  # WET
-        0: "⚫",  # UNKNOWN
-    }
-    return tyres.get(tyre_int, "⚫")
+    return _TYRE_EMOJI[_tyre_index(tyre_int)]
 
 
 def get_tyre_name(tyre_int: int) -> str:
     """Get name for tyre compound."""
-    tyres = {
-        1: "SOFT",
-        2: "MEDIUM",
-        3: "HARD",
-        4: "INTER",
-        5: "WET",
-        0: "N/A",
-    }
-    return tyres.get(tyre_int, "N/A")
+    return _TYRE_NAME[_tyre_index(tyre_int)]
 
 
 def rgb_to_hex(rgb: Tuple[int, int, int]) -> str:
@@ -64,11 +79,30 @@ def rgb_to_hex(rgb: Tuple[int, int, int]) -> str:
     return f'#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}'
 
 
+SELECTED_ROW_STYLE = "background-color: rgba(255, 24, 1, 0.4)"
+
+
+def _style_leaderboard(df: pd.DataFrame, driver_colors: Dict,
+                       selected_driver: Optional[str]) -> "pd.io.formats.style.Styler":
+    """Driver codes in their team colour; the selected driver's row highlighted."""
+    driver_colors = driver_colors or {}
+    code_styles = {
+        code: f"color: {rgb_to_hex(driver_colors.get(code, (128, 128, 128)))}; font-weight: 600"
+        for code in df["Driver"]
+    }
+    styler = df.style.map(code_styles.get, subset=["Driver"])
+    if selected_driver in code_styles:
+        row_styles = np.where(df["Driver"].to_numpy() == selected_driver, SELECTED_ROW_STYLE, "")
+        styler = styler.apply(lambda _: np.repeat(row_styles[:, np.newaxis], df.shape[1], axis=1), axis=None)
+    return styler
+
+
 def render_leaderboard(frame_data: Dict, driver_colors: Dict, 
                        selected_driver: Optional[str] = None,
                        on_driver_click: bool = True) -> Optional[str]:
     """
-    Render race leaderboard with clickable driver rows.
+    Render race leaderboard as a single table with selectable driver rows.
+    Driver codes are shown in team colour and the selected driver's row is highlighted.
     
     Args:
         frame_data: Current frame data with driver positions
@@ -77,147 +111,161 @@ def render_leaderboard(frame_data: Dict, driver_colors: Dict,
         on_driver_click: If True, makes rows clickable
     
     Returns:
-        Selected driver code if clicked, else None
+        Newly selected driver code, else None
     """
     if not frame_data or "drivers" not in frame_data:
         st.info("No leaderboard data available")
         return None
     
     drivers = frame_data["drivers"]
+    if not drivers:
+        st.info("No leaderboard data available")
+        return None
     
-    # Sort by position
-    sorted_drivers = sorted(drivers.items(), 
-                           key=lambda x: x[1].get("position", 99))
-    
-    # Calculate gaps
-    leader_dist = sorted_drivers[0][1].get("dist", 0) if sorted_drivers else 0
-    
-    clicked_driver = None
-    
-    # Custom CSS for leaderboard
-    st.markdown("""
-    <style>
-    .leaderboard-row {
-        display: flex;
-        align-items: center;
-        padding: 8px 12px;
-        margin: 2px 0;
-        border-radius: 8px;
-        background: rgba(31, 40, 51, 0.6);
-        transition: all 0.2s ease;
-        cursor: pointer;
-    }
-    .leaderboard-row:hover {
-        background: rgba(255, 24, 1, 0.2);
-        transform: translateX(5px);
-    }
-    .leaderboard-row.selected {
-        background: rgba(255, 24, 1, 0.4);
-        border-left: 4px solid #FF1801;
-    }
-    .position-badge {
-        font-weight: bold;
-        font-size: 1.1rem;
-        width: 30px;
-        text-align: center;
-    }
-    .driver-code {
-        font-weight: 600;
-        font-size: 1rem;
-        margin-left: 10px;
-        width: 50px;
-    }
-    .tyre-indicator {
-        margin-left: 10px;
-    }
-    .gap-display {
-        margin-left: auto;
-        font-size: 0.9rem;
-        color: #C5C6C7;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    # Column arrays for the frame, sorted by position
+    n = len(drivers)
+    values = list(drivers.values())
+    codes = np.array(list(drivers))
+    pos = np.fromiter((d.get("position", 99) for d in values), dtype=np.int16, count=n)
+    dist = np.fromiter((d.get("dist", 0) for d in values), dtype=np.float64, count=n)
+    order = np.argsort(pos, kind="stable")
+    pos = pos[order]
+    
+    # Gap by distance (simplified), approx seconds
+    gaps = (dist[order[0]] - dist[order]) * (3.6 / 1000.0)
+    
+    # Reuse formatted rows for drivers whose visible state hasn't changed since the last tick
+    row_cache = st.session_state.get("_row_cache")
+    if row_cache is None:
+        row_cache = st.session_state["_row_cache"] = OrderedDict()
+    rows = []
+    for i, p, g in zip(order.tolist(), pos.tolist(), gaps.tolist()):
+        d = values[i]
+        key = (p, codes[i], _tyre_index(d.get("tyre", 0)), d.get("lap", 0), round(g, 1))
+        row = row_cache.get(key)
+        if row is None:
+            row = (p, codes[i], get_tyre_emoji(key[2]), key[3], format_gap(g) if p > 1 else "LEADER")
+            row_cache[key] = row
+        else:
+            row_cache.move_to_end(key)
+        rows.append(row)
+    while len(row_cache) > 2 * n:
+        row_cache.popitem(last=False)
+    df = pd.DataFrame(rows, columns=["Pos", "Driver", "Tyre", "Lap", "Gap"])
+    styled = _style_leaderboard(df, driver_colors, selected_driver)
     
     st.markdown("### 📊 Leaderboard")
     
-    for code, data in sorted_drivers:
-        pos = data.get("position", "?")
-        tyre = data.get("tyre", 0)
-        dist = data.get("dist", 0)
-        lap = data.get("lap", 0)
-        
-        # Calculate gap (simplified - by distance)
-        gap = (leader_dist - dist) / 1000 * 3.6  # Approx gap in seconds
-        gap_str = format_gap(gap) if pos > 1 else "LEADER"
-        
-        color = driver_colors.get(code, (128, 128, 128))
-        hex_color = rgb_to_hex(color)
-        
-        is_selected = code == selected_driver
-        row_class = "leaderboard-row selected" if is_selected else "leaderboard-row"
-        
-        # Create button for each row
-        col1, col2 = st.columns([10, 1])
-        with col1:
-            if st.button(
-                f"P{pos} | {code} {get_tyre_emoji(tyre)} | LAP {lap} | {gap_str}",
-                key=f"driver_{code}",
-                width='stretch',
-                type="secondary" if not is_selected else "primary"
-            ):
-                clicked_driver = code
+    # One table widget instead of a button per driver
+    if not on_driver_click:
+        st.dataframe(styled, hide_index=True, width='stretch', height=LEADERBOARD_HEIGHT)
+        return None
     
-    return clicked_driver
+    event = st.dataframe(
+        styled,
+        on_select="rerun",
+        selection_mode="single-row",
+        hide_index=True,
+        width='stretch',
+        height=LEADERBOARD_HEIGHT,
+        key="leaderboard"
+    )
+    
+    # The selection is a row index that persists across reruns while the order
+    # keeps changing, so only act on the rerun where the user changed it.
+    selected_rows = event.selection.rows
+    if selected_rows == st.session_state.get("_leaderboard_rows"):
+        return None
+    st.session_state["_leaderboard_rows"] = selected_rows
+    if selected_rows:
+        code = df["Driver"].iat[selected_rows[0]]
+        if code != selected_driver:
+            return code
+    return None
+
+
+SPEED_OPTIONS: Tuple[float, ...] = (0.5, 1.0, 2.0, 4.0, 8.0)
+TRANSPORT_ACTIONS: Tuple[str, ...] = ("restart", "back30", "playpause", "fwd30")
+TRANSPORT_LABELS: Dict[str, str] = {"restart": "⏮️", "back30": "⏪", "fwd30": "⏩"}
+
+
+@dataclass(slots=True)
+class PlaybackState:
+    """Result of render_playback_controls; one instance per session, updated in place."""
+    is_playing: bool
+    speed: float
+    seek_time: Optional[float] = None
+    seek_lap: Optional[int] = None
+
+
+def _seek(state: PlaybackState, seek_time: float) -> None:
+    state.seek_time = seek_time
+
+
+def _toggle_play(state: PlaybackState) -> None:
+    state.is_playing = not state.is_playing
+
+
+_TRANSPORT_DISPATCH: Dict[str, Callable] = {
+    "restart": lambda r, t, max_t: _seek(r, 0),
+    "back30": lambda r, t, max_t: _seek(r, max(0, t - 30)),
+    "playpause": lambda r, t, max_t: _toggle_play(r),
+    "fwd30": lambda r, t, max_t: _seek(r, min(max_t, t + 30)),
+}
+
+
+def _on_transport_change():
+    """Turn the transport selection into a one-shot action and clear the widget."""
+    st.session_state["_transport_action"] = st.session_state.playback_transport
+    st.session_state.playback_transport = None
 
 
 def render_playback_controls(current_time: float, max_time: float,
                              current_lap: int, total_laps: int,
-                             is_playing: bool, playback_speed: float) -> Dict:
+                             is_playing: bool, playback_speed: float) -> PlaybackState:
     """
     Render playback controls for race replay.
     
     Returns:
-        Dict with updated control states
+        PlaybackState with updated control states
     """
-    result = {
-        "is_playing": is_playing,
-        "speed": playback_speed,
-        "seek_time": None,
-        "seek_lap": None,
-    }
+    result = st.session_state.get("_playback")
+    if result is None:
+        result = st.session_state["_playback"] = PlaybackState(is_playing, playback_speed)
+    # Seeks are one-shot; never replay one from the previous run
+    result.seek_time = None
+    result.seek_lap = None
+    result.is_playing = is_playing
+    result.speed = playback_speed
     
     st.markdown("### ⏯️ Playback Controls")
     
-    # Main controls row
-    col1, col2, col3, col4, col5 = st.columns([1, 1, 1, 1, 2])
+    # Transport and speed as two segmented controls instead of five buttons
+    col1, col2 = st.columns([3, 2])
     
     with col1:
-        if st.button("⏮️", help="Restart", width='stretch'):
-            result["seek_time"] = 0
+        st.segmented_control(
+            "Transport",
+            TRANSPORT_ACTIONS,
+            format_func=lambda a: ("⏸️" if is_playing else "▶️") if a == "playpause" else TRANSPORT_LABELS[a],
+            key="playback_transport",
+            on_change=_on_transport_change,
+            label_visibility="collapsed"
+        )
+        action = st.session_state.pop("_transport_action", None)
+        if action:
+            _TRANSPORT_DISPATCH[action](result, current_time, max_time)
             
     with col2:
-        if st.button("⏪", help="Rewind 30s", width='stretch'):
-            result["seek_time"] = max(0, current_time - 30)
-            
-    with col3:
-        if is_playing:
-            if st.button("⏸️", help="Pause", width='stretch'):
-                result["is_playing"] = False
-        else:
-            if st.button("▶️", help="Play", width='stretch'):
-                result["is_playing"] = True
-                
-    with col4:
-        if st.button("⏩", help="Forward 30s", width='stretch'):
-            result["seek_time"] = min(max_time, current_time + 30)
-            
-    with col5:
-        speed_options = [0.5, 1.0, 2.0, 4.0, 8.0]
-        current_idx = speed_options.index(playback_speed) if playback_speed in speed_options else 1
-        
-        if st.button(f"🔄 {playback_speed}x", help="Change speed", width='stretch'):
-            next_idx = (current_idx + 1) % len(speed_options)
-            result["speed"] = speed_options[next_idx]
+        speed = st.segmented_control(
+            "Speed",
+            SPEED_OPTIONS,
+            default=playback_speed if playback_speed in SPEED_OPTIONS else None,
+            format_func=lambda v: f"{v:g}x",
+            label_visibility="collapsed"
+        )
+        if speed is not None:
+            result.speed = speed
     
     # Time/Lap display
     col1, col2 = st.columns(2)
@@ -226,23 +274,74 @@ def render_playback_controls(current_time: float, max_time: float,
     with col2:
         st.markdown(f"**🏁 Lap:** {current_lap}/{total_laps}")
     
-    # Seek slider
-    seek_time = st.slider(
+    # Seek slider, in whole seconds: playback only moves it when the second changes,
+    # and any other value means the user dragged it
+    cur_sec = int(current_time)
+    slider_sec = st.session_state.get("seek_slider")
+    synced_sec = st.session_state.get("_slider_sec")
+    if slider_sec is not None and synced_sec is not None and slider_sec != synced_sec:
+        result.seek_time = float(slider_sec)
+        st.session_state["_slider_sec"] = slider_sec
+    elif synced_sec != cur_sec or slider_sec is None:
+        st.session_state["_slider_sec"] = cur_sec
+        st.session_state["seek_slider"] = cur_sec
+    
+    st.slider(
         "Seek",
-        min_value=0.0,
-        max_value=max_time,
-        value=current_time,
-        step=1.0,
-        format="%.0f s",
+        min_value=0,
+        max_value=max(int(math.ceil(max_time)), 1),
+        step=1,
+        format="%d s",
+        key="seek_slider",
         label_visibility="collapsed"
     )
     
-    if abs(seek_time - current_time) > 2:  # Only trigger if significantly different
-        result["seek_time"] = seek_time
-    
     return result
 
 
+@st.fragment
+def leaderboard_panel(frame_data: Dict, driver_colors: Dict, selected_key: str) -> None:
+    """
+    Leaderboard as a fragment: row selection reruns only this panel, and the
+    page reruns once, only when the selected driver (st.session_state[selected_key]) changes.
+    """
+    clicked = render_leaderboard(frame_data, driver_colors,
+                                 selected_driver=st.session_state.get(selected_key))
+    if clicked:
+        st.session_state[selected_key] = clicked
+        st.rerun(scope="app")
+
+
+@st.fragment
+def playback_panel(current_time: float, max_time: float, current_lap: int, total_laps: int,
+                   playing_key: str, speed_key: str, time_key: str) -> None:
+    """
+    Playback controls as a fragment, reading and writing the page's session state keys.
+    Speed changes stay local to the fragment; play/pause and seeks rerun the page.
+    """
+    controls = render_playback_controls(
+        current_time=current_time,
+        max_time=max_time,
+        current_lap=current_lap,
+        total_laps=total_laps,
+        is_playing=st.session_state[playing_key],
+        playback_speed=st.session_state[speed_key]
+    )
+    
+    # Speed is picked up by the next playback tick
+    if controls.speed != st.session_state[speed_key]:
+        st.session_state[speed_key] = controls.speed
+    rerun_app = False
+    if controls.is_playing != st.session_state[playing_key]:
+        st.session_state[playing_key] = controls.is_playing
+        rerun_app = True
+    if controls.seek_time is not None:
+        st.session_state[time_key] = controls.seek_time
+        rerun_app = True
+    if rerun_app:
+        st.rerun(scope="app")
+
+
 def render_driver_telemetry(frame_data: Dict, driver_code: str,
                             driver_colors: Dict) -> None:
     """
@@ -335,69 +434,74 @@ def render_weather_widget(weather_data: Optional[Dict]) -> None:
             dir_str = format_wind_direction(wind_dir)
             st.metric("🌬️ Wind", f"{wind_speed:.0f} km/h {dir_str}")
     
-    # Rain status
-    rain_state = weather_data.get("rain_state", "DRY")
-    rain_color = "#00FF00" if rain_state == "DRY" else "#0080FF"
-    st.markdown(f"""
-    <div style="text-align: center; padding: 10px; border-radius: 8px;
-                background: {rain_color}22; border: 1px solid {rain_color};">
-        {'🌧️ RAINING' if rain_state != 'DRY' else '☀️ DRY CONDITIONS'}
-    </div>
-    """, unsafe_allow_html=True)
+    # Rain status (styles live in app/assets/custom.css)
+    if weather_data.get("rain_state", "DRY") == "DRY":
+        st.markdown('<div class="rain-status dry">☀️ DRY CONDITIONS</div>', unsafe_allow_html=True)
+    else:
+        st.markdown('<div class="rain-status wet">🌧️ RAINING</div>', unsafe_allow_html=True)
+
 
+_COMPASS_POINTS: Tuple[str, ...] = ("N", "NNE", "NE", "ENE", "E", "ESE", "SE", "SSE",
+                                   "S", "SSW", "SW", "WSW", "W", "WNW", "NW", "NNW")
 
+
+@functools.lru_cache(maxsize=360)
 def format_wind_direction(degrees: Optional[float]) -> str:
     """Convert wind direction degrees to compass direction."""
     if degrees is None:
         return ""
-    
-    deg_norm = degrees % 360
-    dirs = ["N", "NNE", "NE", "ENE", "E", "ESE", "SE", "SSE",
-            "S", "SSW", "SW", "WSW", "W", "WNW", "NW", "NNW"]
-    idx = int((deg_norm / 22.5) + 0.5) % len(dirs)
-    return dirs[idx]
+    return _COMPASS_POINTS[int((degrees % 360) * (16.0 / 360.0) + 0.5) & 15]
+
+
+# Track status code -> (banner text, CSS class in app/assets/custom.css)
+TRACK_STATUS_CONFIG: Dict[str, Tuple[str, str]] = {
+    "1": ("GREEN FLAG", "green"),
+    "2": ("⚠️ YELLOW FLAG", "yellow"),
+    "4": ("🚗 SAFETY CAR", "sc"),
+    "5": ("🔴 RED FLAG", "red"),
+    "6": ("⚠️ VIRTUAL SAFETY CAR", "vsc"),
+    "7": ("VSC ENDING", "vsc-ending"),
+}
+
+
+def get_track_status(track_statuses: List[Dict], current_time: float) -> str:
+    """Status code active at current_time ("1", green, if none covers it)."""
+    if not track_statuses:
+        return "1"
+    
+    # Sort once per status list; reruns during playback only bisect
+    key = (id(track_statuses), len(track_statuses))
+    cached = st.session_state.get("_flag_index")
+    if cached is None or cached[0] != key:
+        ordered = sorted(track_statuses, key=lambda s: s.get("start_time", 0))
+        starts = [s.get("start_time", 0) for s in ordered]
+        cached = (key, starts, ordered)
+        st.session_state["_flag_index"] = cached
+    _, starts, ordered = cached
+    
+    i = bisect.bisect_right(starts, current_time) - 1
+    if i < 0:
+        return "1"
+    entry = ordered[i]
+    end = entry.get("end_time")
+    if end is None or current_time < end:
+        return entry.get("status", "1")
+    return "1"
 
 
 def render_track_status_banner(track_statuses: List[Dict], current_time: float) -> None:
     """
     Render track status banner (flags, safety car, etc.)
     """
-    current_status = "1"  # Default: Green
-    
-    for status in track_statuses:
-        start = status.get("start_time", 0)
-        end = status.get("end_time")
-        
-        if start <= current_time and (end is None or current_time < end):
-            current_status = status.get("status", "1")
-            break
-    
-    status_config = {
-        "1": {"text": "GREEN FLAG", "color": "#00FF00", "bg": "#00FF0022"},
-        "2": {"text": "⚠️ YELLOW FLAG", "color": "#FFD700", "bg": "#FFD70033"},
-        "4": {"text": "🚗 SAFETY CAR", "color": "#FF8C00", "bg": "#FF8C0033"},
-        "5": {"text": "🔴 RED FLAG", "color": "#FF0000", "bg": "#FF000044"},
-        "6": {"text": "⚠️ VIRTUAL SAFETY CAR", "color": "#FF4500", "bg": "#FF450033"},
-        "7": {"text": "VSC ENDING", "color": "#FF6347", "bg": "#FF634733"},
-    }
-    
-    config = status_config.get(current_status, status_config["1"])
+    current_status = get_track_status(track_statuses, current_time)
     
     if current_status != "1":
-        st.markdown(f"""
-        <div style="text-align: center; padding: 12px; border-radius: 8px;
-                    background: {config['bg']}; border: 2px solid {config['color']};
-                    font-weight: bold; font-size: 1.2rem; color: {config['color']};
-                    animation: pulse 1.5s infinite;">
-            {config['text']}
-        </div>
-        <style>
-        @keyframes pulse {{
-            0%, 100% {{ opacity: 1; }}
-            50% {{ opacity: 0.7; }}
-        }}
-        </style>
-        """, unsafe_allow_html=True)
+        text, css_class = TRACK_STATUS_CONFIG.get(current_status, TRACK_STATUS_CONFIG["1"])
+        st.markdown(f'<div class="track-status {css_class}">{text}</div>', unsafe_allow_html=True)
+
+
+DEFAULT_SESSION_YEARS: Tuple[int, ...] = tuple(range(2024, 2018, -1))  # 2024 down to 2019
+SESSION_CODES: Dict[str, str] = {"Race": "R", "Sprint": "S", "Qualifying": "Q"}
 
 
 def render_session_selector(available_years: List[int] = None) -> Tuple[int, int, str]:
@@ -408,7 +512,7 @@ def render_session_selector(available_years: List[int] = None) -> Tuple[int, int
         Tuple of (year, round_number, session_type)
     """
     if available_years is None:
-        available_years = list(range(2024, 2018, -1))  # 2024 down to 2019
+        available_years = DEFAULT_SESSION_YEARS
     
     col1, col2, col3 = st.columns(3)
     
@@ -422,11 +526,10 @@ def render_session_selector(available_years: List[int] = None) -> Tuple[int, int
     with col3:
         session_type = st.selectbox(
             "📋 Session",
-            ["Race", "Sprint", "Qualifying"],
+            tuple(SESSION_CODES),
             index=0
         )
         
-        session_map = {"Race": "R", "Sprint": "S", "Qualifying": "Q"}
-        session_code = session_map[session_type]
+        session_code = SESSION_CODES[session_type]
     
     return year, round_number, session_code
@@ -1,5 +1,32 @@
 import streamlit as st
-import os
+
+# Pages relative to app/ (path, label, icon)
+PAGES = (
+    ("main.py", "Home", "🏠"),
+    ("pages/1_Season_Central.py", "Season Central", "🏁"),
+    ("pages/2_analytics.py", "Analytics", "📊"),
+    ("pages/3_predictions.py", "Predictions", "🔮"),
+    ("pages/4_live_monitor.py", "Live Monitor", "📡"),
+    ("pages/5_race_engineer.py", "Race Engineer", "🤖"),
+    ("pages/6_past_races.py", "Past Races", "🏁"),
+)
+
+def _chat_history_markdown():
+    """Markdown for the whole chat, extended incrementally as messages are appended."""
+    messages = st.session_state.messages
+    rendered_until = st.session_state.get("_rendered_until", 0)
+    if rendered_until > len(messages):  # History was cleared/replaced
+        rendered_until = 0
+        st.session_state._chat_markdown = ""
+    if rendered_until < len(messages):
+        new_lines = [
+            f"**{'You' if msg['role'] == 'user' else 'Olof'}:** {msg['content']}"
+            for msg in messages[rendered_until:]
+        ]
+        previous = st.session_state.get("_chat_markdown", "") if rendered_until else ""
+        st.session_state._chat_markdown = "\n\n".join(([previous] if previous else []) + new_lines)
+        st.session_state._rendered_until = len(messages)
+    return st.session_state._chat_markdown
 
 def render_sidebar():
     with st.sidebar:
@@ -20,53 +47,48 @@ def render_sidebar():
         # Chat Interface in Expander (only if agent loaded)
         if st.session_state.agent is not None:
             with st.expander("🤖 Race Engineer (Olof)", expanded=False):
-                # Display history
-                for msg in st.session_state.messages:
-                    if msg["role"] == "user":
-                        st.markdown(f"**You:** {msg['content']}")
-                    else:
-                        st.markdown(f"**Olof:** {msg['content']}")
+                # Display history as one element, formatting only messages added since the last paint
+                st.markdown(_chat_history_markdown())
                 
-                # Input
-                prompt = st.text_input("Ask Olof:", key="sidebar_chat_input")
+                # Input (chat_input only returns the prompt on the run it was submitted)
+                prompt = st.chat_input("Ask Olof:", key="sidebar_chat_input")
                 if prompt:
                     # Add user message
                     st.session_state.messages.append({"role": "user", "content": prompt})
+                    st.markdown(f"**You:** {prompt}")
                     
-                    # Generate response
-                    with st.spinner("Thinking..."):
-                        response = st.session_state.agent.ask(prompt)
-                        st.session_state.messages.append({"role": "assistant", "content": response})
-                    
-                    # Rerun to update chat
-                    st.rerun()
+                    # Stream the response in place; the history picks it up on the next run
+                    with st.chat_message("assistant"):
+                        response = st.write_stream(st.session_state.agent.ask_stream(prompt))
+                    st.session_state.messages.append({"role": "assistant", "content": response})
         
         st.divider()
         
         # Navigation - use proper path resolution
         st.markdown("### Navigation")
         
-        # Get the app directory path
-        app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        
-        # Define pages with their paths relative to app/ directory
-        pages = [
-            ("app/main.py", "Home", "🏠"),
-            ("app/pages/1_Season_Central.py", "Season Central", "🏁"),
-            ("app/pages/2_analytics.py", "Analytics", "📊"),
-            ("app/pages/3_predictions.py", "Predictions", "🔮"),
-            ("app/pages/4_live_monitor.py", "Live Monitor", "📡"),
-            ("app/pages/5_race_engineer.py", "Race Engineer", "🤖"),
-            ("app/pages/6_past_races.py", "Past Races", "🏁"),
-        ]
-        
-        for page_path, label, icon in pages:
-            try:
-                st.page_link(page_path, label=label, icon=icon)
-            except Exception:
-                # Fallback: try without app/ prefix (depends on how streamlit is run)
+        page_paths = st.session_state.get("_page_paths")
+        first = 0
+        if page_paths is None:
+            # Paths resolve against the entrypoint's directory, which depends on how
+            # streamlit was launched; probe once with the first link, then remember
+            page_paths = ()  # Links unavailable: plain labels
+            page_path, label, icon = PAGES[0]
+            for prefix in ("app/", ""):
                 try:
-                    alt_path = page_path.replace("app/", "")
-                    st.page_link(alt_path, label=label, icon=icon)
+                    st.page_link(prefix + page_path, label=label, icon=icon)
+                    page_paths = tuple(prefix + path for path, _, _ in PAGES)
+                    break
                 except Exception:
-                    st.markdown(f"{icon} {label}")
+                    continue
+            else:
+                st.markdown(f"{icon} {label}")
+            st.session_state._page_paths = page_paths
+            first = 1
+        
+        for i in range(first, len(PAGES)):
+            _, label, icon = PAGES[i]
+            if page_paths:
+                st.page_link(page_paths[i], label=label, icon=icon)
+            else:
+                st.markdown(f"{icon} {label}")
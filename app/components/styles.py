@@ -0,0 +1,24 @@
+"""
+Shared page styling.
+
+The stylesheet is read and wrapped once per file version; reruns only stat the file
+and re-send the cached string, so edits still show up without a restart.
+"""
+
+import os
+
+import streamlit as st
+
+
+@st.cache_resource(max_entries=8)
+def _load_css(file_name: str, mtime: float) -> str:
+    with open(file_name) as f:
+        return f'<style>{f.read()}</style>'
+
+
+def local_css(file_name: str) -> None:
+    """Inject a CSS file into the page."""
+    try:
+        st.markdown(_load_css(file_name, os.path.getmtime(file_name)), unsafe_allow_html=True)
+    except OSError as e:
+        print(f"Failed to load CSS {file_name}: {e}")
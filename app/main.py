@@ -1,12 +1,9 @@
 import streamlit as st
-import fastf1
 import datetime
 import pandas as pd
-import matplotlib.pyplot as plt
-import io
-import base64
 import os
-import pytz
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from app.components.sidebar import render_sidebar
 
 # Page Config
@@ -18,21 +15,22 @@ st.set_page_config(
 )
 
 # Inject Custom CSS
-def local_css(file_name):
-    with open(file_name) as f:
-        st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
-
+from app.components.styles import local_css
 local_css("app/assets/custom.css")
 
 # Enable Cache
 if not os.path.exists('f1_cache'):
     os.makedirs('f1_cache')
 
-# Configure retries BEFORE enabling cache/making requests
-from utils.api_config import configure_fastf1_retries
-configure_fastf1_retries()
-
-fastf1.Cache.enable_cache('f1_cache')
+@st.cache_resource
+def _load_fastf1():
+    """Import and configure FastF1 once per process, on the first schedule fetch."""
+    import fastf1
+    from utils.api_config import configure_fastf1_retries
+    # Configure retries BEFORE enabling cache/making requests
+    configure_fastf1_retries()
+    fastf1.Cache.enable_cache('f1_cache')
+    return fastf1
 
 # Render Sidebar
 render_sidebar()
@@ -42,7 +40,7 @@ render_sidebar()
 from utils.time_simulation import get_current_time
 
 @st.cache_data(ttl=300)  # Reduced TTL to 5 mins for quicker season transition detection
-def get_schedule_with_fallback(_simulated_time=None):
+def get_schedule_with_fallback(_now=None):
     """
     Get event schedule with fallback to next year if current season is over.
     Returns (schedule, is_next_year_schedule, season_status).
@@ -53,27 +51,37 @@ def get_schedule_with_fallback(_simulated_time=None):
     - 'season_ended': The final race has completed, showing next season
     - 'preseason': Showing pre-season testing from next year
     
-    Note: _simulated_time is passed for cache busting in debug mode
+    _now is the caller's current (possibly simulated) time; it isn't part of the
+    cache key, so a cached result reflects the time it was computed at.
     """
+    _load_fastf1()
+    from utils.race_utils import (
+        ensure_utc, first_event_after, get_schedule_for_year, get_next_season_schedule,
+    )
+    
     # Use time simulation for debug mode
-    now = get_current_time()
+    now = _now or get_current_time()
     current_year = now.year
     
+    # Both seasons are requested up front so an end-of-season lookup costs one round-trip,
+    # not two; next year's result is only waited on when a branch below needs it
+    pool = ThreadPoolExecutor(max_workers=2)
+    current_future = pool.submit(get_schedule_for_year, current_year)
+    next_future = pool.submit(get_next_season_schedule, current_year + 1)
+    
     try:
-        schedule = fastf1.get_event_schedule(current_year)
+        schedule = current_future.result()
         
         # Ensure date columns are timezone-aware
-        for col in ['EventDate', 'Session1Date', 'Session2Date', 'Session3Date', 'Session4Date', 'Session5Date']:
-            if col in schedule.columns:
-                schedule[col] = pd.to_datetime(schedule[col], utc=True)
+        ensure_utc(schedule)
         
         # Check if there are any upcoming events (with 3-day buffer)
-        upcoming = schedule[schedule['EventDate'] + datetime.timedelta(days=3) > now]
+        idx = first_event_after(schedule, now - datetime.timedelta(days=3))
         
-        if not upcoming.empty:
+        if idx < len(schedule):
             # Check if this is the FINAL race of the season
-            current_event = upcoming.iloc[0]
-            max_round = schedule['RoundNumber'].max()
+            current_event = schedule.iloc[idx]
+            max_round = int(schedule['RoundNumber'].iat[-1])  # Schedule rows are in round order
             is_final_race = current_event['RoundNumber'] == max_round
             
             if is_final_race:
@@ -84,20 +92,13 @@ def get_schedule_with_fallback(_simulated_time=None):
                 if now > race_end_time:
                     # Final race is done! Try to transition to next season
                     print(f"Season {current_year} complete! Checking for {current_year + 1} schedule...")
-                    try:
-                        next_year_schedule = fastf1.get_event_schedule(current_year + 1)
-                        if not next_year_schedule.empty:
-                            for col in ['EventDate', 'Session1Date', 'Session2Date', 'Session3Date', 'Session4Date', 'Session5Date']:
-                                if col in next_year_schedule.columns:
-                                    next_year_schedule[col] = pd.to_datetime(next_year_schedule[col], utc=True)
-                            return next_year_schedule, True, 'season_ended'
-                        else:
-                            # 2026 schedule not available yet - show season complete
-                            print(f"No {current_year + 1} schedule available yet")
-                            return schedule, False, 'season_complete'
-                    except Exception:
-                        # If next year schedule fails, show season complete
-                        return schedule, False, 'season_complete'
+                    next_year_schedule = next_future.result()
+                    if next_year_schedule is not None:
+                        ensure_utc(next_year_schedule)
+                        return next_year_schedule, True, 'season_ended'
+                    # Next year's schedule not available yet (or failed recently) - show season complete
+                    print(f"No {current_year + 1} schedule available yet")
+                    return schedule, False, 'season_complete'
                 
                 elif now > current_event['Session5Date']:
                     # Final race is currently in progress
@@ -107,106 +108,156 @@ def get_schedule_with_fallback(_simulated_time=None):
             return schedule, False, 'active'
         
         # No upcoming events in current year - fallback to next year (pre-season testing)
-        try:
-            next_year_schedule = fastf1.get_event_schedule(current_year + 1)
-            if not next_year_schedule.empty:
-                for col in ['EventDate', 'Session1Date', 'Session2Date', 'Session3Date', 'Session4Date', 'Session5Date']:
-                    if col in next_year_schedule.columns:
-                        next_year_schedule[col] = pd.to_datetime(next_year_schedule[col], utc=True)
-                return next_year_schedule, True, 'preseason'
-            else:
-                # No next year schedule - show season complete message
-                return schedule, False, 'season_complete'
-        except Exception:
-            return schedule, False, 'season_complete'
+        next_year_schedule = next_future.result()
+        if next_year_schedule is not None:
+            ensure_utc(next_year_schedule)
+            return next_year_schedule, True, 'preseason'
+        # No next year schedule - show season complete message
+        return schedule, False, 'season_complete'
         
     except Exception as e:
         print(f"Error fetching schedule: {e}")
         return pd.DataFrame(), False, 'error'
-
-from utils.race_utils import get_track_map_image
+    finally:
+        # Don't block the page on a speculative fetch nobody needed
+        pool.shutdown(wait=False, cancel_futures=True)
 
 # --- Auto-Update Check ---
-@st.cache_resource(ttl=3600) # Check max once per hour per session
+@st.cache_resource
+def _auto_update_lock():
+    """One lock per process, shared by every script run, so two update checks never overlap."""
+    return threading.Lock()
+
+@st.cache_resource(ttl=3600) # Check max once per hour per process
 def run_auto_update():
-    try:
-        from scripts.auto_update import check_and_update
-        import threading
-        # Run in a separate thread to not block UI load significantly
-        # although for first run it might be better to block briefly or show a spinner?
-        # Let's block briefly as it's critical data, but rely on the script's internal checks which are fast if no update needed.
-        
-        # We can also put it in a spinner
-        check_and_update()
-        return datetime.datetime.now()
-    except Exception as e:
-        print(f"Auto-update failed: {e}")
-        return None
+    """Start the data update check on a daemon thread; returns its shared status dict."""
+    status = {"state": "running", "started": datetime.datetime.now()}
+    lock = _auto_update_lock()
+    
+    def _worker():
+        if not lock.acquire(blocking=False):
+            status["state"] = "skipped"
+            return
+        try:
+            from scripts.auto_update import check_and_update
+            check_and_update()
+            status["state"] = "done"
+        except Exception as e:
+            print(f"Auto-update failed: {e}")
+            status["state"] = "failed"
+        finally:
+            status["finished"] = datetime.datetime.now()
+            lock.release()
+    
+    threading.Thread(target=_worker, name="auto-update", daemon=True).start()
+    return status
+
+# --- Hero Section Templates ---
+# Built once at import; each run only fills in the fields
+_STATUS_NOTES = {
+    'final_race_live': "<div style='color: #FF1801; font-size: 0.85rem; margin-top: 8px; font-weight: 600;'>🏁 SEASON FINALE IN PROGRESS</div>",
+    'season_ended': "<div style='color: #00D4AA; font-size: 0.85rem; margin-top: 8px;'>✨ 2025 Season Complete • Gearing up for 2026!</div>",
+    'season_complete': "<div style='color: #00D4AA; font-size: 0.85rem; margin-top: 8px;'>🏆 2025 Season Complete • See you in 2026!</div>",
+    'preseason': "<div style='color: #888; font-size: 0.8rem; margin-top: 10px;'>📆 Pre-Season Testing</div>",
+}
+
+_TRACK_MAP_IMG_TPL = '<img src="{src}" style="max-height: 160px; filter: drop-shadow(0 0 15px rgba(0, 243, 255, 0.3)); animation: fadeIn 2s ease-out;" />'
+
+_HERO_TPL = """
+    <div class="hero-container" style="display: flex; gap: 3rem; align-items: center; justify-content: center;">
+    <div class="hero-content">
+    <h1 class="hero-title">IGNITE YOUR <span class="text-gradient">PASSION</span></h1>
+    <p class="hero-subtitle">Next Event: {event_name}{status_note}</p>
+    <div style="display: flex; gap: 3rem; align-items: center; justify-content: center;">
+    <div style="text-align: left;">
+    <div class="hero-stat-label">Countdown</div>
+    <div class="hero-stat">{countdown_str}</div>
+    </div>
+    <div style="text-align: left;">
+    <div class="hero-stat-label">Location</div>
+    <div style="font-size: 1.5rem; font-weight: 600;">{location}</div>
+    </div>
+    <div style="margin-left: 2rem;">
+    {track_map_tag}
+    </div>
+    </div>
+    </div>
+    </div>
+    """
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _hero_static(event_year, round_number, season_status, _next_race):
+    """
+    The parts of the hero that don't tick with the clock, keyed on the event and season status.
+    _next_race is the schedule row as a dict; it isn't hashed.
+    """
+    # Countdown targets Session5Date (race start) like Season Central, falling back to EventDate
+    race_start = _next_race.get('Session5Date')
+    if race_start is None or pd.isna(race_start):
+        race_start = _next_race['EventDate']
+    
+    # Always generate track map regardless of time distance
+    from utils.race_utils import get_track_map_image
+    return {
+        'event_name': _next_race['EventName'],
+        'round_num': _next_race['RoundNumber'],
+        'date_str': _next_race['EventDate'].strftime('%d %b %Y'),
+        'location': f"{_next_race['Location']}, {_next_race['Country']}",
+        'track_map_img': get_track_map_image(_next_race),
+        'status_note': _STATUS_NOTES.get(season_status, ""),
+        'race_start_ns': race_start.value,
+    }
 
 # --- Main Execution ---
 if __name__ == "__main__":
-    # Trigger Auto Update Check (Background-ish)
-    run_auto_update()
+    # Trigger Auto Update Check (runs in the background; the page renders immediately)
+    update_status = run_auto_update()
+    if update_status["state"] == "running" and "auto_update_status" not in st.session_state:
+        st.toast("Updating data in background…")
+    st.session_state['auto_update_status'] = update_status["state"]
 
     try:
-        # Pass simulated time as cache buster for debug mode
-        simulated = None
-        schedule, is_next_year, season_status = get_schedule_with_fallback(simulated)
+        # One "now" per run, shared with the schedule lookup
         now_utc = get_current_time()
+        schedule, is_next_year, season_status = get_schedule_with_fallback(now_utc)
         
-        # Filter for upcoming events (with 3-day buffer)
+        # Next upcoming event (with 3-day buffer)
         if not schedule.empty:
-            future_races = schedule[schedule['EventDate'] + datetime.timedelta(days=3) > now_utc]
+            from utils.race_utils import first_event_after
+            next_idx = first_event_after(schedule, now_utc - datetime.timedelta(days=3))
         else:
-            future_races = pd.DataFrame()
+            next_idx = 0
         
-        if not future_races.empty:
-            next_race = future_races.iloc[0]
+        if next_idx < len(schedule):
+            # Plain dict: one extraction instead of a Series lookup per field
+            next_race = schedule.iloc[next_idx:next_idx + 1].to_dict('records')[0]
+            hero = _hero_static(
+                int(next_race['EventDate'].year), int(next_race['RoundNumber']), season_status, next_race
+            )
+            event_name = hero['event_name']
+            round_num = hero['round_num']
+            date_str = hero['date_str']
+            track_map_img = hero['track_map_img']
+            status_note = hero['status_note']
             
-            # Countdown Logic - use Session5Date (race start) like Season Central
-            # Fall back to EventDate if Session5Date is not available
-            race_start = next_race.get('Session5Date')
-            if pd.isna(race_start) or race_start is None:
-                race_start = next_race['EventDate']
+            # Only the countdown depends on "now": whole seconds from int64 epoch nanoseconds
+            seconds_left = (hero['race_start_ns'] - pd.Timestamp(now_utc).value) // 1_000_000_000
             
-            time_left = race_start - now_utc
-            event_name = next_race['EventName']
-            round_num = next_race['RoundNumber']
-            date_str = next_race['EventDate'].strftime('%d %b %Y')
-            
-            # Check if event is within 1 week (7 days)
-            one_week = datetime.timedelta(days=7)
-            is_within_week = time_left <= one_week
-            
-            # Always generate track map regardless of time distance
-            track_map_img = get_track_map_image(next_race)
-            
-            if time_left.total_seconds() <= 0:
+            if seconds_left <= 0:
                 # Race has started or finished
                 countdown_str = "🏁 IN PROGRESS"
-                location = f"{next_race['Location']}, {next_race['Country']}"
-            elif is_within_week:
+                location = hero['location']
+            elif seconds_left <= 7 * 86400:
                 # Event is within 1 week - show full countdown and location
-                days = time_left.days
-                hours, remainder = divmod(time_left.seconds, 3600)
-                minutes, seconds = divmod(remainder, 60)
+                days, remainder = divmod(seconds_left, 86400)
+                hours, remainder = divmod(remainder, 3600)
+                minutes = remainder // 60
                 countdown_str = f"{days}d {hours:02d}h {minutes:02d}m"
-                location = f"{next_race['Location']}, {next_race['Country']}"
+                location = hero['location']
             else:
                 # Event is more than 1 week away - show "Coming Soon" style
                 countdown_str = "🗓️ Coming Soon"
-                location = f"{date_str}"  # Show date instead of location
-            
-            # Context-aware status notes
-            status_note = ""
-            if season_status == 'final_race_live':
-                status_note = "<div style='color: #FF1801; font-size: 0.85rem; margin-top: 8px; font-weight: 600;'>🏁 SEASON FINALE IN PROGRESS</div>"
-            elif season_status == 'season_ended':
-                status_note = "<div style='color: #00D4AA; font-size: 0.85rem; margin-top: 8px;'>✨ 2025 Season Complete • Gearing up for 2026!</div>"
-            elif season_status == 'season_complete':
-                status_note = "<div style='color: #00D4AA; font-size: 0.85rem; margin-top: 8px;'>🏆 2025 Season Complete • See you in 2026!</div>"
-            elif season_status == 'preseason':
-                status_note = "<div style='color: #888; font-size: 0.8rem; margin-top: 10px;'>📆 Pre-Season Testing</div>"
+                location = date_str  # Show date instead of location
             
         else:
             event_name = "Season Ended"
@@ -230,27 +281,11 @@ if __name__ == "__main__":
     # --- Main Content with Custom HTML ---
     
     # Hero Section
-    st.markdown(f"""
-    <div class="hero-container" style="display: flex; gap: 3rem; align-items: center; justify-content: center;">
-    <div class="hero-content">
-    <h1 class="hero-title">IGNITE YOUR <span class="text-gradient">PASSION</span></h1>
-    <p class="hero-subtitle">Next Event: {event_name}{status_note}</p>
-    <div style="display: flex; gap: 3rem; align-items: center; justify-content: center;">
-    <div style="text-align: left;">
-    <div class="hero-stat-label">Countdown</div>
-    <div class="hero-stat">{countdown_str}</div>
-    </div>
-    <div style="text-align: left;">
-    <div class="hero-stat-label">Location</div>
-    <div style="font-size: 1.5rem; font-weight: 600;">{location}</div>
-    </div>
-    <div style="margin-left: 2rem;">
-    {f'<img src="{track_map_img}" style="max-height: 160px; filter: drop-shadow(0 0 15px rgba(0, 243, 255, 0.3)); animation: fadeIn 2s ease-out;" />' if track_map_img else ''}
-    </div>
-    </div>
-    </div>
-    </div>
-    """, unsafe_allow_html=True)
+    track_map_tag = _TRACK_MAP_IMG_TPL.format(src=track_map_img) if track_map_img else ''
+    st.markdown(_HERO_TPL.format(
+        event_name=event_name, status_note=status_note, countdown_str=countdown_str,
+        location=location, track_map_tag=track_map_tag,
+    ), unsafe_allow_html=True)
     
     # Features Grid (Navigation)
     st.markdown("""
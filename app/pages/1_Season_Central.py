@@ -4,27 +4,23 @@ import streamlit as st
 st.set_page_config(page_title="Season Central", page_icon="🏁", layout="wide")
 
 import pandas as pd
-import fastf1
+import numpy as np
 import datetime
-import pytz
 from utils.race_utils import (
     get_next_upcoming_race, 
     get_current_standings, 
     get_latest_completed_session,
     get_session_results,
-    get_track_map_image
+    get_track_map_image,
+    get_schedule_for_year,
+    ensure_utc,
+    first_event_after
 )
 from app.components.sidebar import render_sidebar
 from utils.time_simulation import get_current_time, get_current_year
 
 # Inject Custom CSS
-def local_css(file_name):
-    try:
-        with open(file_name) as f:
-            st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
-    except:
-        pass
-
+from app.components.styles import local_css
 local_css("app/assets/custom.css")
 
 # Render Sidebar
@@ -43,6 +39,11 @@ def load_engine():
 
 engine = load_engine()
 
+@st.cache_data(ttl=12 * 3600, show_spinner=False)  # Inputs only change race to race
+def predict_race(_engine, year, race_name, n_sims):
+    """Monte Carlo race prediction, shared across reruns and sessions (_engine isn't hashed)."""
+    return _engine.predict_next_race(year=year, race_name=race_name, n_sims=n_sims)
+
 # --- HELPER: Team Colors ---
 TEAM_COLORS = {
     'Red Bull Racing': '#0600EF',
@@ -62,9 +63,14 @@ TEAM_COLORS = {
 def get_team_color(team_name):
     return TEAM_COLORS.get(team_name, '#FFFFFF')
 
-def highlight_team(row):
-    color = get_team_color(row['Team' if 'Team' in row else 'TeamName'])
-    return [f'border-left: 5px solid {color}' for _ in row]
+def make_highlight(team_col):
+    """Row styler for Styler.apply(axis=1); the team column is resolved once per table."""
+    def highlight_team(row):
+        return [f'border-left: 5px solid {get_team_color(row[team_col])}'] * len(row)
+    return highlight_team
+
+def style_by_team(df):
+    return df.style.apply(make_highlight('Team' if 'Team' in df.columns else 'TeamName'), axis=1)
 
 # --- HEADER ---
 current_year = get_current_year()
@@ -75,7 +81,7 @@ st.subheader("📅 Current Race Weekend")
 
 # Get Schedule
 try:
-    schedule = fastf1.get_event_schedule(current_year)
+    schedule = get_schedule_for_year(current_year)
 except Exception as e:
     st.error(f"Could not load schedule for {current_year}: {e}")
     schedule = pd.DataFrame()
@@ -85,18 +91,17 @@ now_utc = get_current_time()
 # Find next or active race (EventDate + 1 day buffer)
 # Ensure columns are datetime
 if not schedule.empty:
-    for col in ['EventDate', 'Session1Date', 'Session2Date', 'Session3Date', 'Session4Date', 'Session5Date']:
-        if col in schedule.columns:
-            schedule[col] = pd.to_datetime(schedule[col], utc=True)
+    ensure_utc(schedule)
 
 # Filter for future or recent events (within 3 days past)
 if not schedule.empty and 'EventDate' in schedule.columns:
-    upcoming = schedule[schedule['EventDate'] + datetime.timedelta(days=3) > now_utc]
+    next_idx = first_event_after(schedule, now_utc - datetime.timedelta(days=3))
+    upcoming = schedule.iloc[next_idx:next_idx + 1]
 else:
     upcoming = pd.DataFrame()
 
 if not upcoming.empty:
-    next_event = upcoming.iloc[0]
+    next_event = upcoming.head(1).to_dict('records')[0]
     
     # Ensure track_img is defined before use
     track_img = get_track_map_image(next_event)
@@ -121,11 +126,11 @@ if not upcoming.empty:
         race_start = next_event['Session5Date'] # Usually the race
         
         if pd.notna(race_start):
-            delta = race_start - now_utc
-            if delta.total_seconds() > 0:
-                d = delta.days
-                h, r = divmod(delta.seconds, 3600)
-                m, s = divmod(r, 60)
+            seconds_left = (race_start.value - pd.Timestamp(now_utc).value) // 1_000_000_000
+            if seconds_left > 0:
+                d, r = divmod(seconds_left, 86400)
+                h, r = divmod(r, 3600)
+                m = r // 60
                 st.markdown(f"""
                 <div style="background: rgba(255, 24, 1, 0.1); border: 1px solid #FF1801; border-radius: 8px; padding: 15px; text-align: center; margin-bottom: 20px;">
                     <h4 style="margin:0; color: #aaa;">RACE START IN</h4>
@@ -139,22 +144,22 @@ if not upcoming.empty:
 
         # Session Schedule
         st.markdown("### 🗓️ Session Schedule")
-        sessions_df = []
-        for i in range(1, 6):
-            s_name = next_event[f'Session{i}']
-            s_date = next_event[f'Session{i}Date']
-            if s_name and pd.notna(s_date):
-                status = "✅ Completed" if s_date < now_utc else "🔜 Upcoming"
-                if abs((s_date - now_utc).total_seconds()) < 7200 and s_date < now_utc: # Within 2 hours
-                    status = "🔴 LIVE / Recent"
-                    
-                sessions_df.append({
-                    "Session": s_name,
-                    "Time (Local/UTC)": s_date.strftime('%a %H:%M'),
-                    "Status": status
-                })
+        sessions = [(next_event[f'Session{i}'], next_event[f'Session{i}Date']) for i in range(1, 6)]
+        sessions = [(s_name, s_date) for s_name, s_date in sessions if s_name and pd.notna(s_date)]
+        
+        # Status for all sessions at once from int64 ns offsets to now
+        delta_ns = np.array([s_date.value for _, s_date in sessions], dtype='i8') - pd.Timestamp(now_utc).value
+        status = np.where(
+            delta_ns < 0,
+            np.where(delta_ns > -7_200_000_000_000, "🔴 LIVE / Recent", "✅ Completed"),  # Within 2 hours
+            "🔜 Upcoming"
+        )
         
-        st.dataframe(pd.DataFrame(sessions_df), hide_index=True, width='stretch')
+        st.dataframe(pd.DataFrame({
+            "Session": [s_name for s_name, _ in sessions],
+            "Time (Local/UTC)": [s_date.strftime('%a %H:%M') for _, s_date in sessions],
+            "Status": status
+        }), hide_index=True, width='stretch')
 
 else:
     # Fallback: Show most recent completed event (off-season)
@@ -164,7 +169,7 @@ else:
         completed = pd.DataFrame()
     
     if not completed.empty:
-        next_event = completed.iloc[-1]  # Most recent completed
+        next_event = completed.tail(1).to_dict('records')[0]  # Most recent completed
         
         st.info(f"📅 **Off-Season** - Showing most recent event from {current_year}")
         
@@ -214,14 +219,12 @@ else:
     else:
         # Try previous year if current year has no events yet
         try:
-            prev_schedule = fastf1.get_event_schedule(current_year - 1)
-            for col in ['EventDate', 'Session1Date', 'Session2Date', 'Session3Date', 'Session4Date', 'Session5Date']:
-                if col in prev_schedule.columns:
-                    prev_schedule[col] = pd.to_datetime(prev_schedule[col], utc=True)
+            prev_schedule = get_schedule_for_year(current_year - 1)
+            ensure_utc(prev_schedule)
             
             prev_completed = prev_schedule[prev_schedule['EventDate'] < now_utc]
             if not prev_completed.empty:
-                next_event = prev_completed.iloc[-1]
+                next_event = prev_completed.tail(1).to_dict('records')[0]
                 st.info(f"📅 Showing last event from {current_year - 1} season")
                 
                 track_img = get_track_map_image(next_event)
@@ -268,10 +271,10 @@ if latest_session:
         
         with col_res1:
             st.markdown("#### Top 10")
-            chunk1 = results.iloc[:10].reset_index(drop=True)
-            chunk1.index += 1
+            chunk1 = results.iloc[:10]
+            chunk1 = chunk1.set_axis(range(1, 1 + len(chunk1)))  # Relabel without a reset_index copy
             st.dataframe(
-                chunk1.style.apply(highlight_team, axis=1), 
+                style_by_team(chunk1), 
                 width='stretch',
                 column_config={
                     "Position": st.column_config.NumberColumn("Pos", format="%d")
@@ -280,11 +283,11 @@ if latest_session:
 
         with col_res2:
             st.markdown("#### 11 - 20")
-            chunk2 = results.iloc[10:20].reset_index(drop=True)
+            chunk2 = results.iloc[10:20]
             if not chunk2.empty:
-                chunk2.index = range(11, 11 + len(chunk2))
+                chunk2 = chunk2.set_axis(range(11, 11 + len(chunk2)))
                 st.dataframe(
-                    chunk2.style.apply(highlight_team, axis=1), 
+                    style_by_team(chunk2), 
                     width='stretch',
                     column_config={
                         "Position": st.column_config.NumberColumn("Pos", format="%d")
@@ -327,7 +330,7 @@ with col_stand2:
     st.markdown("### 🛠️ Constructors")
     if not c_stand.empty:
         st.dataframe(
-            c_stand.style.apply(highlight_team, axis=1),
+            style_by_team(c_stand),
             width='stretch',
             height=400,
             column_config={
@@ -357,7 +360,8 @@ if not upcoming.empty:
             with st.spinner(f"Simulating {race_obj['EventName']}..."):
                 # Use Dynasty Engine logic
                 try:
-                    preds = engine.predict_next_race(
+                    preds = predict_race(
+                        engine,
                         year=race_obj['EventDate'].year,
                         race_name=race_obj['EventName'],
                         n_sims=500
@@ -4,26 +4,31 @@ import streamlit as st
 st.set_page_config(page_title="Race Analytics", page_icon="📈", layout="wide")
 
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 import fastf1
 import fastf1.plotting
 from datetime import datetime
 from utils.db import get_supabase_client
+from utils.race_utils import get_schedule_for_year as get_full_schedule
 from app.components.sidebar import render_sidebar
 from utils.logger import get_logger
-from utils.time_simulation import get_current_time, get_current_year
+from utils.time_simulation import get_current_time, get_current_year, to_utc
 
 logger = get_logger(__name__)
 
-# Inject Custom CSS
-def local_css(file_name):
-    try:
-        with open(file_name) as f:
-            st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
-    except:
-        pass
+MAX_3D_POINTS = 5000  # Telemetry samples per 3D map; a fastest lap can carry far more
 
+# Map display names to FastF1 codes
+SESSION_CODE_MAP = {
+    'Practice 1': 'FP1', 'Practice 2': 'FP2', 'Practice 3': 'FP3',
+    'Qualifying': 'Q', 'Race': 'R', 'Sprint': 'S', 'Sprint Qualifying': 'SQ',
+    'Sprint Shootout': 'SS'
+}
+
+# Inject Custom CSS
+from app.components.styles import local_css
 local_css("app/assets/custom.css")
 
 # Render Sidebar
@@ -39,14 +44,14 @@ def get_available_years(_simulated_time=None):
     # Assume we want to show up to the current simulated year
     return list(range(current_year, 2017, -1))  # 2018 to current year
 
-@st.cache_data(ttl=3600)
 def get_schedule_for_year(year, _simulated_time=None):
-    """Get race schedule for a given year"""
+    """Get completed races for a given year (the full schedule is cached in race_utils)"""
     try:
-        schedule = fastf1.get_event_schedule(year)
+        # Past seasons are cached for a month, the current one for minutes
+        schedule = get_full_schedule(year)
         # Filter to completed events and exclude testing
-        schedule = schedule[schedule['RoundNumber'] > 0]
-        schedule['EventDate'] = pd.to_datetime(schedule['EventDate'], utc=True)
+        schedule = schedule[schedule['RoundNumber'] > 0].copy()
+        schedule['EventDate'] = to_utc(schedule['EventDate'])
         completed = schedule[schedule['EventDate'] < get_current_time()]
         return completed
     except Exception as e:
@@ -68,17 +73,93 @@ def get_available_sessions(year, round_num):
         logger.warning(f"Failed to get sessions: {e}")
         return ['Race']  # Default fallback
 
-@st.cache_data
-def load_fastf1_session(year, race_round, session_type='R'):
-    """Load FastF1 session with specified type"""
+def _load_session(year, race_round, session_type, telemetry):
     try:
         session = fastf1.get_session(year, race_round, session_type)
-        session.load(telemetry=True, weather=False, messages=False)
+        session.load(laps=True, telemetry=telemetry, weather=False, messages=False)
         return session
     except Exception as e:
         logger.warning(f"Failed to load FastF1 session: {e}")
         return None
 
+# Sessions are shared as-is; cache_data would pickle all telemetry per hit.
+# Past seasons' sessions never change, so they live longer (bounded, they're ~100MB each).
+@st.cache_resource(ttl=7 * 86400, max_entries=4, show_spinner=False)
+def _load_archived_session(year, race_round, session_type, telemetry):
+    return _load_session(year, race_round, session_type, telemetry)
+
+@st.cache_resource(ttl=3600, show_spinner=False)
+def _load_recent_session(year, race_round, session_type, telemetry):
+    return _load_session(year, race_round, session_type, telemetry)
+
+def load_fastf1_session(year, race_round, session_type='R', telemetry=False):
+    """Load FastF1 session with specified type (read-only for callers).
+
+    Car/position data is only downloaded when telemetry=True; laps and results always are.
+    """
+    if year < get_current_year():
+        return _load_archived_session(year, race_round, session_type, telemetry)
+    return _load_recent_session(year, race_round, session_type, telemetry)
+
+def _fastest_lap(year, race_round, session_type, driver):
+    """A driver's fastest lap from the cached telemetry session, or None if there isn't one"""
+    session = load_fastf1_session(year, race_round, session_type, telemetry=True)
+    lap = session.laps.pick_driver(driver).pick_fastest()
+    if lap is None or lap.empty:
+        return None
+    return lap
+
+# Only plain arrays are cached: a Lap holds a reference to its whole Session
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def get_fastest_lap_trace(year, race_round, session_type, driver):
+    """(distance, speed) arrays for a driver's fastest lap, or None if there isn't one"""
+    lap = _fastest_lap(year, race_round, session_type, driver)
+    if lap is None:
+        return None
+    tel = lap.get_telemetry().add_distance()
+    return tel['Distance'].to_numpy(), tel['Speed'].to_numpy()
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def get_fastest_lap_delta(year, race_round, session_type, driver1, driver2):
+    """(distance, delta) arrays from fastf1.utils.delta_time between two drivers' fastest laps"""
+    lap1 = _fastest_lap(year, race_round, session_type, driver1)
+    lap2 = _fastest_lap(year, race_round, session_type, driver2)
+    delta_time, ref_tel, _ = fastf1.utils.delta_time(lap1, lap2)
+    return ref_tel['Distance'].to_numpy(), np.asarray(delta_time)
+
+# Fallback if FastF1 doesn't know a team
+BACKUP_TEAM_COLORS = {
+    'Red Bull Racing': '#0600EF', 'Red Bull': '#0600EF',
+    'Mercedes': '#00D2BE',
+    'Ferrari': '#DC0000',
+    'McLaren': '#FF8700',
+    'Aston Martin': '#006F62',
+    'Alpine': '#0090FF',
+    'Williams': '#005AFF',
+    'RB': '#2B4562', 'AlphaTauri': '#2B4562', 'Toro Rosso': '#469BFF',
+    'Haas F1 Team': '#FFFFFF', 'Haas': '#FFFFFF',
+    'Kick Sauber': '#52E252', 'Sauber': '#52E252', 'Alfa Romeo': '#900000',
+    'Racing Point': '#F596C8', 'Force India': '#F596C8',
+    'Renault': '#FFF500'
+}
+
+@st.cache_resource
+def _fastf1_team_colors():
+    """FastF1's own team color table, lowercased (empty if this FastF1 doesn't ship one)"""
+    return {name.lower(): color for name, color in getattr(fastf1.plotting, 'TEAM_COLORS', {}).items()}
+
+@st.cache_data(ttl=86400, show_spinner=False)
+def get_team_colors(teams):
+    """Team -> hex color for the given teams, resolved once per team set"""
+    known = _fastf1_team_colors()
+    colors = {}
+    for team in teams:
+        name = str(team).lower()
+        # FastF1 keys are short names ('red bull', 'haas'), so fall back to a containment match
+        color = known.get(name) or next((c for key, c in known.items() if key in name), None)
+        colors[team] = color or BACKUP_TEAM_COLORS.get(team, '#555555')
+    return colors
+
 # --- HEADER ---
 st.title("📈 Race Analytics")
 
@@ -98,21 +179,16 @@ with col2:
         st.stop()
     
     # Create race options
-    race_options = {f"R{row['RoundNumber']}: {row['EventName']}": row['RoundNumber'] 
-                   for _, row in schedule.iterrows()}
+    rounds = schedule['RoundNumber']
+    labels = "R" + rounds.astype(str) + ": " + schedule['EventName']
+    race_options = dict(zip(labels, rounds.tolist()))
     selected_race_label = st.selectbox("🏁 Race Weekend", list(race_options.keys()))
     selected_round = race_options[selected_race_label]
 
 with col3:
     sessions = get_available_sessions(selected_year, selected_round)
-    # Map display names to FastF1 codes
-    session_code_map = {
-        'Practice 1': 'FP1', 'Practice 2': 'FP2', 'Practice 3': 'FP3',
-        'Qualifying': 'Q', 'Race': 'R', 'Sprint': 'S', 'Sprint Qualifying': 'SQ',
-        'Sprint Shootout': 'SS'
-    }
     selected_session = st.selectbox("📋 Session", sessions)
-    session_code = session_code_map.get(selected_session, 'R')
+    session_code = SESSION_CODE_MAP.get(selected_session, 'R')
 
 st.markdown("---")
 
@@ -131,10 +207,12 @@ laps_df['driver_code'] = laps_df['Driver']
 if laps_df.empty:
     st.info("No lap data available for this session.")
 else:
-    # Tabs
-    tab1, tab2, tab3 = st.tabs(["📈 Race Overview", "🏎️ Circuit Analysis", "⚔️ Competitor Analysis"])
+    # Views (unlike st.tabs, only the selected one runs, so telemetry loads on demand)
+    views = ["📈 Race Overview", "🏎️ Circuit Analysis", "⚔️ Competitor Analysis"]
+    view = st.segmented_control("View", views, default=views[0], key="analytics_view",
+                                label_visibility="collapsed") or views[0]
     
-    with tab1:
+    if view == views[0]:
         # 1. Lap Time Distribution
         st.subheader("Lap Time Distribution")
         
@@ -150,71 +228,68 @@ else:
         laps_df = laps_df.dropna(subset=['lap_time_s'])
         
         # Filter outliers (e.g., pit laps, SC)
-        q95 = laps_df['lap_time_s'].quantile(0.95)
-        clean_laps = laps_df[laps_df['lap_time_s'] < q95]
+        lap_times = laps_df['lap_time_s'].to_numpy()  # NaNs already dropped
+        q95 = np.quantile(lap_times, 0.95) if len(lap_times) else np.nan
 
         # Check available columns for safe plotting
-        driver_col = 'Driver' if 'Driver' in clean_laps.columns else 'driver_code'
-        color_col = 'Team' if 'Team' in clean_laps.columns else None
+        driver_col = 'Driver' if 'Driver' in laps_df.columns else 'driver_code'
+        color_col = 'Team' if 'Team' in laps_df.columns else None
+        compound_col = 'Compound' if 'Compound' in laps_df.columns else 'compound'
+        lap_num_col = 'LapNumber' if 'LapNumber' in laps_df.columns else 'lap_number'
+        
+        # Keep only the columns the charts use, so Plotly serializes nothing else
+        plot_cols = [c for c in (driver_col, 'lap_time_s', color_col, compound_col, lap_num_col)
+                     if c in laps_df.columns]
+        clean_laps = laps_df.loc[lap_times < q95, plot_cols]
+        
+        # Categoricals let Plotly split traces on codes instead of hashing strings row by row
+        clean_laps = clean_laps.astype(
+            {c: 'category' for c in (driver_col, color_col, compound_col) if c in clean_laps.columns}
+        )
+        driver_order = {driver_col: clean_laps[driver_col].cat.categories.tolist()}
         
         # Build dynamic color map using FastF1
-        team_color_map = {}
-        if color_col:
-            unique_teams = clean_laps[color_col].unique()
-            for team in unique_teams:
-                try:
-                    # fastf1.plotting.team_color returns hex (e.g. #ff0000)
-                    # We use a fallback just in case
-                    c = fastf1.plotting.team_color(team)
-                    team_color_map[team] = c
-                except:
-                    # Fallback to hardcoded map if FastF1 fails
-                    backup_colors = {
-                        'Red Bull Racing': '#0600EF', 'Red Bull': '#0600EF',
-                        'Mercedes': '#00D2BE',
-                        'Ferrari': '#DC0000',
-                        'McLaren': '#FF8700',
-                        'Aston Martin': '#006F62',
-                        'Alpine': '#0090FF',
-                        'Williams': '#005AFF',
-                        'RB': '#2B4562', 'AlphaTauri': '#2B4562', 'Toro Rosso': '#469BFF',
-                        'Haas F1 Team': '#FFFFFF', 'Haas': '#FFFFFF',
-                        'Kick Sauber': '#52E252', 'Sauber': '#52E252', 'Alfa Romeo': '#900000',
-                        'Racing Point': '#F596C8', 'Force India': '#F596C8',
-                        'Renault': '#FFF500'
-                    }
-                    team_color_map[team] = backup_colors.get(team, '#555555')
+        team_color_map = get_team_colors(tuple(clean_laps[color_col].unique())) if color_col else {}
 
         # Box plot for lap time distribution
         if color_col:
             fig_box = px.box(clean_laps, x=driver_col, y='lap_time_s', color=color_col, 
                              title="Lap Time Distribution by Driver",
                              labels={'lap_time_s': 'Lap Time (s)', driver_col: 'Driver'},
+                             category_orders=driver_order,
                              color_discrete_map=team_color_map)
         else:
             fig_box = px.box(clean_laps, x=driver_col, y='lap_time_s', 
                              title="Lap Time Distribution by Driver",
-                             labels={'lap_time_s': 'Lap Time (s)', driver_col: 'Driver'})
+                             labels={'lap_time_s': 'Lap Time (s)', driver_col: 'Driver'},
+                             category_orders=driver_order)
         st.plotly_chart(fig_box,  width="stretch")
 
         # 2. Tyre Strategy
         st.subheader("Tyre Strategy")
-        compound_col = 'Compound' if 'Compound' in clean_laps.columns else 'compound'
-        lap_num_col = 'LapNumber' if 'LapNumber' in clean_laps.columns else 'lap_number'
-        
         if compound_col in clean_laps.columns:
-            fig_tyre = px.scatter(clean_laps, x=lap_num_col, y=driver_col, color=compound_col, symbol=compound_col,
-                                  title="Tyre Compound Usage per Lap",
-                                  labels={lap_num_col: 'Lap Number', driver_col: 'Driver'})
-            fig_tyre.update_traces(marker=dict(size=8))
+            # One bar per stint (a driver's run of laps on one compound) instead of a mark per lap
+            tyre_laps = clean_laps.sort_values([driver_col, lap_num_col])
+            new_stint = (tyre_laps[compound_col].ne(tyre_laps[compound_col].shift())
+                         | tyre_laps[driver_col].ne(tyre_laps[driver_col].shift()))
+            stints = (tyre_laps.groupby([driver_col, new_stint.cumsum().rename('stint')], observed=True)
+                      .agg(start=(lap_num_col, 'min'), end=(lap_num_col, 'max'), compound=(compound_col, 'first'))
+                      .reset_index())
+            stints['laps'] = stints['end'] - stints['start'] + 1
+            stints['left'] = stints['start'] - 0.5  # Center each lap on its number
+            fig_tyre = px.bar(stints, x='laps', y=driver_col, base='left', color='compound', orientation='h',
+                              title="Tyre Compound Usage per Lap",
+                              labels={'laps': 'Lap Number', driver_col: 'Driver', 'compound': 'Compound'},
+                              hover_data={'start': True, 'end': True, 'laps': False, 'left': False})
             st.plotly_chart(fig_tyre,  width="stretch")
         else:
             st.info("Tyre compound data not available for this session.")
 
-    with tab2:
+    elif view == views[1]:
         st.subheader("Interactive Circuit Analysis")
         
-        # Session already loaded above
+        with st.spinner("Loading telemetry..."):
+            session = load_fastf1_session(selected_year, selected_round, session_code, telemetry=True)
         if session:
             # Select Visualization Type
             viz_type = st.radio("Select Visualization", ["3D Speed Map", "Gear Shift Map"], horizontal=True)
@@ -229,40 +304,44 @@ else:
                 if 'Z' not in tel.columns:
                     tel['Z'] = 0
                 
+                # Decimate uniformly to at most MAX_3D_POINTS; the gear map also keeps
+                # every shift point so no gear run drops out of the trace
+                step = max(1, len(tel) // MAX_3D_POINTS)
+                keep = np.arange(len(tel)) % step == 0
+                if viz_type == "Gear Shift Map":
+                    keep |= tel['nGear'].diff().ne(0).to_numpy()
+                tel = tel[keep].reset_index(drop=True)
+                
                 if viz_type == "3D Speed Map":
-                    fig_3d = px.scatter_3d(tel, x='X', y='Y', z='Z', color='Speed',
-                                          title=f"{session.event.EventName} - 3D Speed Map",
-                                          color_continuous_scale='Plasma',
-                                          opacity=0.8)
-                    fig_3d.update_traces(marker=dict(size=3))
-                    fig_3d.update_layout(scene=dict(aspectmode='data', xaxis=dict(visible=False), yaxis=dict(visible=False), zaxis=dict(visible=False)),
-                                         margin=dict(l=0, r=0, b=0, t=30),
-                                         paper_bgcolor='rgba(0,0,0,0)',
-                                         plot_bgcolor='rgba(0,0,0,0)',
-                                         font=dict(color='white'))
-                    st.plotly_chart(fig_3d, width="stretch")
-                    
+                    color_col, title, colorscale = 'Speed', "3D Speed Map", 'Plasma'
                 else:  # Gear Shift Map
-                    fig_3d = px.scatter_3d(tel, x='X', y='Y', z='Z', color='nGear',
-                                          title=f"{session.event.EventName} - 3D Gear Shift Map",
-                                          color_continuous_scale='Viridis',
-                                          opacity=0.8)
-                    fig_3d.update_traces(marker=dict(size=3))
-                    fig_3d.update_layout(scene=dict(aspectmode='data', xaxis=dict(visible=False), yaxis=dict(visible=False), zaxis=dict(visible=False)),
-                                         margin=dict(l=0, r=0, b=0, t=30),
-                                         paper_bgcolor='rgba(0,0,0,0)',
-                                         plot_bgcolor='rgba(0,0,0,0)',
-                                         font=dict(color='white'))
-                    st.plotly_chart(fig_3d, width="stretch")
+                    color_col, title, colorscale = 'nGear', "3D Gear Shift Map", 'Viridis'
+                
+                # Raw Scatter3d from numpy columns skips Plotly Express's dataframe introspection
+                fig_3d = go.Figure(go.Scatter3d(
+                    x=tel['X'].to_numpy(), y=tel['Y'].to_numpy(), z=tel['Z'].to_numpy(),
+                    mode='markers',
+                    marker=dict(size=3, color=tel[color_col].to_numpy(), colorscale=colorscale,
+                                opacity=0.8, showscale=True, colorbar=dict(title=color_col))
+                ))
+                fig_3d.update_layout(title=f"{session.event.EventName} - {title}",
+                                     scene=dict(aspectmode='data', xaxis=dict(visible=False), yaxis=dict(visible=False), zaxis=dict(visible=False)),
+                                     margin=dict(l=0, r=0, b=0, t=30),
+                                     paper_bgcolor='rgba(0,0,0,0)',
+                                     plot_bgcolor='rgba(0,0,0,0)',
+                                     font=dict(color='white'))
+                st.plotly_chart(fig_3d, width="stretch")
         else:
             st.error("Failed to load FastF1 session data.")
 
-    with tab3:
+    else:
         st.subheader("Competitor Analysis")
         
+        with st.spinner("Loading telemetry..."):
+            session = load_fastf1_session(selected_year, selected_round, session_code, telemetry=True)
         if session:
-            drivers = sorted(session.drivers)
-            drivers = [d for d in drivers if d in session.results['Abbreviation'].values]
+            with_results = set(session.results['Abbreviation'].tolist())
+            drivers = [d for d in sorted(session.drivers) if d in with_results]
             
             if len(drivers) < 2:
                 st.warning("Not enough drivers with valid data for comparison.")
@@ -274,20 +353,20 @@ else:
                     driver2 = st.selectbox("Driver 2", drivers, index=min(1, len(drivers)-1))
                     
                 if driver1 and driver2 and driver1 != driver2:
-                    laps1 = session.laps.pick_driver(driver1).pick_fastest()
-                    laps2 = session.laps.pick_driver(driver2).pick_fastest()
+                    # Cached per driver, so switching one selectbox only builds the new driver's trace
+                    trace1 = get_fastest_lap_trace(selected_year, selected_round, session_code, driver1)
+                    trace2 = get_fastest_lap_trace(selected_year, selected_round, session_code, driver2)
                     
-                    if laps1 is not None and laps2 is not None and not laps1.empty and not laps2.empty:
-                        tel1 = laps1.get_telemetry().add_distance()
-                        tel2 = laps2.get_telemetry().add_distance()
-                        
+                    if trace1 is not None and trace2 is not None:
                         # Calculate Delta
-                        delta_time, ref_tel, compare_tel = fastf1.utils.delta_time(laps1, laps2)
+                        delta_distance, delta_time = get_fastest_lap_delta(
+                            selected_year, selected_round, session_code, driver1, driver2
+                        )
                         
                         # Plot Speed Trace
                         fig_comp = go.Figure()
-                        fig_comp.add_trace(go.Scatter(x=tel1['Distance'], y=tel1['Speed'], mode='lines', name=driver1, line=dict(color='cyan')))
-                        fig_comp.add_trace(go.Scatter(x=tel2['Distance'], y=tel2['Speed'], mode='lines', name=driver2, line=dict(color='magenta')))
+                        fig_comp.add_trace(go.Scattergl(x=trace1[0], y=trace1[1], mode='lines', name=driver1, line=dict(color='cyan')))
+                        fig_comp.add_trace(go.Scattergl(x=trace2[0], y=trace2[1], mode='lines', name=driver2, line=dict(color='magenta')))
                         
                         fig_comp.update_layout(title=f"Speed Comparison: {driver1} vs {driver2}", 
                                                xaxis_title="Distance (m)", yaxis_title="Speed (km/h)")
@@ -295,7 +374,7 @@ else:
                         
                         # Plot Delta
                         fig_delta = go.Figure()
-                        fig_delta.add_trace(go.Scatter(x=ref_tel['Distance'], y=delta_time, mode='lines', name=f"Delta ({driver2} to {driver1})", line=dict(color='white')))
+                        fig_delta.add_trace(go.Scattergl(x=delta_distance, y=delta_time, mode='lines', name=f"Delta ({driver2} to {driver1})", line=dict(color='white')))
                         fig_delta.add_hline(y=0, line_dash="dash", line_color="gray")
                         
                         fig_delta.update_layout(title=f"Time Delta: {driver2} relative to {driver1}", 
@@ -13,13 +13,7 @@ from app.components.sidebar import render_sidebar
 
 
 # Inject Custom CSS
-def local_css(file_name):
-    try:
-        with open(file_name) as f:
-            st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
-    except:
-        pass
-
+from app.components.styles import local_css
 local_css("app/assets/custom.css")
 
 # Render Sidebar
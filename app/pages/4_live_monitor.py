@@ -13,7 +13,6 @@ import pandas as pd
 import fastf1
 from datetime import datetime, timezone, timedelta
 import os
-import pytz
 from utils.logger import get_logger
 from utils.time_simulation import get_current_time
 
@@ -28,13 +27,7 @@ st.set_page_config(
 )
 
 # Inject Custom CSS
-def local_css(file_name):
-    try:
-        with open(file_name) as f:
-            st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
-    except Exception as e:
-        logger.warning(f"Failed to load CSS {file_name}: {e}")
-
+from app.components.styles import local_css
 local_css("app/assets/custom.css")
 
 # Render Sidebar
@@ -53,10 +46,11 @@ from utils.track_renderer import (
     create_position_chart
 )
 from app.components.race_replay import (
-    render_leaderboard,
+    leaderboard_panel,
     render_driver_telemetry,
     render_weather_widget,
     render_track_status_banner,
+    get_track_status,
     format_time,
     rgb_to_hex,
     get_tyre_emoji,
@@ -183,6 +177,91 @@ def check_upcoming_session():
         return None
 
 
+def demo_replay_view(demo_data: dict):
+    """
+    Demo replay controls, track map and leaderboard. Runs as a fragment, so
+    autoplay ticks rerun only this view instead of the whole page.
+    """
+    frames = demo_data["frames"]
+    driver_colors = demo_data.get("driver_colors", {})
+    track_coords = demo_data.get("track_coords", {"x": [], "y": []})
+    track_statuses = demo_data.get("track_statuses", [])
+    total_laps = demo_data.get("total_laps", 0)
+    rotation = demo_data.get("circuit_rotation", 0.0)
+    event_name = demo_data.get("event_name", "Demo Race")
+    
+    max_time = frames[-1]["t"] if frames else 0
+    current_time = st.session_state.demo_time
+    
+    # Get current frame
+    current_frame = get_frame_at_time(frames, current_time)
+    current_lap = current_frame.get("lap", 1) if current_frame else 1
+    
+    # Demo controls
+    col1, col2, col3 = st.columns([1, 1, 3])
+    
+    with col1:
+        # Play/pause reruns the page so the fragment is registered with (or without) its timer
+        if st.session_state.demo_playing:
+            if st.button("⏸️ Pause", width='stretch'):
+                st.session_state.demo_playing = False
+                st.rerun(scope="app")
+        else:
+            if st.button("▶️ Play Demo", width='stretch', type="primary"):
+                st.session_state.demo_playing = True
+                st.rerun(scope="app")
+    
+    with col2:
+        if st.button("🔄 Restart", width='stretch'):
+            st.session_state.demo_time = 0.0
+            st.rerun()
+    
+    with col3:
+        st.markdown(f"**{event_name}** | Lap {current_lap}/{total_laps} | {format_time(current_time)}")
+    
+    st.markdown("---")
+    
+    # Track status
+    current_status = get_track_status(track_statuses, current_time)
+    
+    render_track_status_banner(track_statuses, current_time)
+    
+    # Main layout
+    col_track, col_sidebar = st.columns([2, 1])
+    
+    with col_track:
+        if track_coords.get("x") and current_frame:
+            fig = render_track_map(
+                track_coords=track_coords,
+                frame_data=current_frame,
+                driver_colors=driver_colors,
+                rotation=rotation,
+                height=400,
+                selected_driver=st.session_state.live_selected_driver,
+                track_status=current_status
+            )
+            st.plotly_chart(fig, width='stretch', config={'displayModeBar': False})
+    
+    with col_sidebar:
+        if current_frame:
+            leaderboard_panel(current_frame, driver_colors, "live_selected_driver")
+        
+        st.markdown("---")
+        weather = current_frame.get("weather") if current_frame else None
+        render_weather_widget(weather)
+    
+    # Auto-play demo; the fragment's timer renders the new time on the next tick
+    if st.session_state.demo_playing:
+        new_time = current_time + (1.0 / FPS) * 2.0  # 2x speed for demo
+        
+        if new_time >= max_time:
+            st.session_state.demo_playing = False
+            st.session_state.demo_time = 0.0
+            st.rerun(scope="app")  # Re-register the view without its timer
+        else:
+            st.session_state.demo_time = new_time
+
+
 # ---------- SESSION STATE ----------
 if 'live_mode' not in st.session_state:
     st.session_state.live_mode = 'checking'  # 'live', 'demo', 'checking'
@@ -439,94 +518,9 @@ else:
     demo_data = st.session_state.demo_data
     
     if demo_data and demo_data.get("frames"):
-        frames = demo_data["frames"]
-        driver_colors = demo_data.get("driver_colors", {})
-        track_coords = demo_data.get("track_coords", {"x": [], "y": []})
-        track_statuses = demo_data.get("track_statuses", [])
-        total_laps = demo_data.get("total_laps", 0)
-        rotation = demo_data.get("circuit_rotation", 0.0)
-        event_name = demo_data.get("event_name", "Demo Race")
-        
-        max_time = frames[-1]["t"] if frames else 0
-        current_time = st.session_state.demo_time
-        
-        # Get current frame
-        current_frame = get_frame_at_time(frames, current_time)
-        current_lap = current_frame.get("lap", 1) if current_frame else 1
-        
-        # Demo controls
-        col1, col2, col3 = st.columns([1, 1, 3])
-        
-        with col1:
-            if st.session_state.demo_playing:
-                if st.button("⏸️ Pause", width='stretch'):
-                    st.session_state.demo_playing = False
-            else:
-                if st.button("▶️ Play Demo", width='stretch', type="primary"):
-                    st.session_state.demo_playing = True
-        
-        with col2:
-            if st.button("🔄 Restart", width='stretch'):
-                st.session_state.demo_time = 0.0
-                st.rerun()
-        
-        with col3:
-            st.markdown(f"**{event_name}** | Lap {current_lap}/{total_laps} | {format_time(current_time)}")
-        
-        st.markdown("---")
-        
-        # Track status
-        current_status = "1"
-        for status in track_statuses:
-            if status.get("start_time", 0) <= current_time:
-                if status.get("end_time") is None or current_time < status["end_time"]:
-                    current_status = status.get("status", "1")
-        
-        render_track_status_banner(track_statuses, current_time)
-        
-        # Main layout
-        col_track, col_sidebar = st.columns([2, 1])
-        
-        with col_track:
-            if track_coords.get("x") and current_frame:
-                fig = render_track_map(
-                    track_coords=track_coords,
-                    frame_data=current_frame,
-                    driver_colors=driver_colors,
-                    rotation=rotation,
-                    height=400,
-                    selected_driver=st.session_state.live_selected_driver,
-                    track_status=current_status
-                )
-                st.plotly_chart(fig, width='stretch', config={'displayModeBar': False})
-        
-        with col_sidebar:
-            if current_frame:
-                clicked = render_leaderboard(
-                    current_frame,
-                    driver_colors,
-                    selected_driver=st.session_state.live_selected_driver
-                )
-                if clicked:
-                    st.session_state.live_selected_driver = clicked
-                    st.rerun()
-            
-            st.markdown("---")
-            weather = current_frame.get("weather") if current_frame else None
-            render_weather_widget(weather)
-        
-        # Auto-play demo
-        if st.session_state.demo_playing:
-            new_time = current_time + (1.0 / FPS) * 2.0  # 2x speed for demo
-            
-            if new_time >= max_time:
-                st.session_state.demo_playing = False
-                st.session_state.demo_time = 0.0
-            else:
-                st.session_state.demo_time = new_time
-            
-            time.sleep(1.0 / FPS)
-            st.rerun()
+        # Autoplay reruns the fragment every frame interval; paused, it only reruns on interaction
+        run_every = 1.0 / FPS if st.session_state.demo_playing else None
+        st.fragment(demo_replay_view, run_every=run_every)(demo_data)
     
     else:
         st.warning("Demo data could not be loaded. Try refreshing the page.")
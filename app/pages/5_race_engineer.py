@@ -6,10 +6,7 @@ from app.components.sidebar import render_sidebar
 st.set_page_config(page_title="AI Race Engineer", page_icon="🤖", layout="wide")
 
 # Inject Custom CSS
-def local_css(file_name):
-    with open(file_name) as f:
-        st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
-
+from app.components.styles import local_css
 local_css("app/assets/custom.css")
 
 # Render Sidebar
@@ -6,12 +6,11 @@ and interactive track map. Inspired by f1-race-replay but optimized for web.
 """
 
 import streamlit as st
-import time
 import fastf1
 import pandas as pd
 from datetime import datetime
 import os
-from utils.time_simulation import get_current_time, get_current_year
+from utils.time_simulation import get_current_time, get_current_year, to_utc
 
 # Page Config - must be first
 st.set_page_config(
@@ -22,13 +21,7 @@ st.set_page_config(
 )
 
 # Inject Custom CSS
-def local_css(file_name):
-    try:
-        with open(file_name) as f:
-            st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
-    except:
-        pass
-
+from app.components.styles import local_css
 local_css("app/assets/custom.css")
 
 # Render Sidebar
@@ -48,11 +41,12 @@ from utils.track_renderer import (
     create_speed_trace
 )
 from app.components.race_replay import (
-    render_leaderboard,
-    render_playback_controls,
+    leaderboard_panel,
+    playback_panel,
     render_driver_telemetry,
     render_weather_widget,
     render_track_status_banner,
+    get_track_status,
     format_time
 )
 
@@ -85,16 +79,13 @@ if 'past_race_key' not in st.session_state:
 def get_event_schedule(year: int, _cache_date: str = None):
     """Get event schedule for a given year, filtered to completed events only."""
     try:
-        from datetime import datetime
-        import pytz
-        
         schedule = fastf1.get_event_schedule(year)
         # Filter only actual races (exclude testing)
         schedule = schedule[schedule['RoundNumber'] > 0].copy()
         
         # Ensure EventDate is timezone-aware
         if 'EventDate' in schedule.columns:
-            schedule['EventDate'] = pd.to_datetime(schedule['EventDate'], utc=True)
+            schedule['EventDate'] = to_utc(schedule['EventDate'])
         
         
         # Filter to only completed events (event date in the past)
@@ -128,101 +119,11 @@ def get_available_sessions(year: int, round_num: int):
     return sessions
 
 
-# ---------- MAIN PAGE ----------
-st.markdown("""
-<div style="text-align: center; padding: 20px 0;">
-    <h1 style="font-size: 2.5rem; margin: 0;">🏁 Past Races</h1>
-    <p style="color: #C5C6C7; margin-top: 10px;">
-        Replay historical races with full telemetry visualization
-    </p>
-</div>
-""", unsafe_allow_html=True)
-
-# ---------- SESSION SELECTION ----------
-st.markdown("---")
-
-col_year, col_race, col_session, col_load = st.columns([1, 2, 1, 1])
-
-with col_year:
-    # Available years (Dynamic based on current/simulated year)
-    current_year_val = get_current_year()
-    # Ensure at least 2025 is included if current year < 2025 (unlikely but safe)
-    max_year = max(current_year_val, 2025)
-    available_years = list(range(max_year, 2018, -1))
-    selected_year = st.selectbox("📅 Year", available_years, index=0)
-
-with col_race:
-    # Get races for selected year (cache key includes date for daily refresh)
-    schedule = get_event_schedule(selected_year, _cache_date=_today)
-    
-    if not schedule.empty:
-        # Create race options
-        race_options = {}
-        for _, row in schedule.iterrows():
-            label = f"R{int(row['RoundNumber'])} - {row['EventName']}"
-            race_options[label] = int(row['RoundNumber'])
-        
-        selected_race_label = st.selectbox("🏎️ Race", list(race_options.keys()))
-        selected_round = race_options[selected_race_label]
-    else:
-        st.warning(f"No completed races found for {selected_year}. Select an earlier year.")
-        selected_round = None
-
-with col_session:
-    if selected_round is not None:
-        session_options = get_available_sessions(selected_year, selected_round)
-        selected_session = st.selectbox("📋 Session", session_options)
-        
-        session_map = {"Race": "R", "Sprint": "S", "Qualifying": "Q"}
-        session_code = session_map.get(selected_session, "R")
-    else:
-        st.selectbox("📋 Session", ["Race"], disabled=True)
-        selected_session = "Race"
-        session_code = "R"
-
-with col_load:
-    st.write("")  # Spacer
-    st.write("")  # Spacer
-    
-    load_button = st.button("🔄 Load Race", type="primary", width="stretch",
-                            disabled=(selected_round is None))
-
-# Check if we need to load new data
-if selected_round is not None:
-    # Key no longer depends on mode (always "full/cached")
-    current_key = f"{selected_year}_{selected_round}_{session_code}"
-    
-    if load_button or (st.session_state.past_race_key != current_key and st.session_state.past_race_data is None):
-        if load_button:
-            st.session_state.past_race_key = current_key
-            st.session_state.past_race_time = 0.0
-            st.session_state.past_race_playing = False
-            st.session_state.past_race_selected_driver = None
-            
-            import time as time_module
-            start_time = time_module.time()
-            
-            with st.spinner(f"Loading {selected_session} data..."):
-                try:
-                    # Always request full_mode=True (which now tries DB cache first)
-                    data = get_race_telemetry_frames(selected_year, selected_round, session_code, full_mode=True)
-                    st.session_state.past_race_data = data
-                    
-                    elapsed = time_module.time() - start_time
-                    
-                    # Determine source
-                    source = "Supabase Cache ⚡" if data.get('_from_cache') else "F1 API (Live Compute)"
-                    st.success(f"✅ Loaded {data['event_name']} via {source} in {elapsed:.1f}s")
-                    
-                except Exception as e:
-                    st.error(f"Failed to load race data: {e}")
-                    st.session_state.past_race_data = None
-
-
-# ---------- VISUALIZATION ----------
-race_data = st.session_state.past_race_data
-
-if race_data and race_data.get("frames"):
+def replay_view(race_data: dict):
+    """
+    Everything that changes with playback time. Runs as a fragment, so autoplay
+    ticks rerun only this view instead of the whole page.
+    """
     frames = race_data["frames"]
     driver_colors = race_data.get("driver_colors", {})
     track_coords = race_data.get("track_coords", {"x": [], "y": []})
@@ -239,11 +140,7 @@ if race_data and race_data.get("frames"):
     current_lap = current_frame.get("lap", 1) if current_frame else 1
     
     # Get current track status
-    current_status = "1"
-    for status in track_statuses:
-        if status.get("start_time", 0) <= current_time:
-            if status.get("end_time") is None or current_time < status["end_time"]:
-                current_status = status.get("status", "1")
+    current_status = get_track_status(track_statuses, current_time)
     
     # ---------- TRACK STATUS BANNER ----------
     render_track_status_banner(track_statuses, current_time)
@@ -288,35 +185,20 @@ if race_data and race_data.get("frames"):
         # Playback controls
         st.markdown("---")
         
-        controls = render_playback_controls(
+        playback_panel(
             current_time=current_time,
             max_time=max_time,
             current_lap=current_lap,
             total_laps=total_laps,
-            is_playing=st.session_state.past_race_playing,
-            playback_speed=st.session_state.past_race_speed
+            playing_key="past_race_playing",
+            speed_key="past_race_speed",
+            time_key="past_race_time"
         )
-        
-        # Update state based on controls
-        if controls["is_playing"] != st.session_state.past_race_playing:
-            st.session_state.past_race_playing = controls["is_playing"]
-        if controls["speed"] != st.session_state.past_race_speed:
-            st.session_state.past_race_speed = controls["speed"]
-        if controls["seek_time"] is not None:
-            st.session_state.past_race_time = controls["seek_time"]
-            st.rerun()
     
     with col_sidebar:
         # Leaderboard
         if current_frame:
-            clicked = render_leaderboard(
-                current_frame,
-                driver_colors,
-                selected_driver=st.session_state.past_race_selected_driver
-            )
-            if clicked:
-                st.session_state.past_race_selected_driver = clicked
-                st.rerun()
+            leaderboard_panel(current_frame, driver_colors, "past_race_selected_driver")
         
         st.markdown("---")
         
@@ -354,18 +236,114 @@ if race_data and race_data.get("frames"):
     
     # ---------- AUTO-PLAY LOGIC ----------
     if st.session_state.past_race_playing:
-        # Advance time
+        # Advance time; the fragment's timer renders it on the next tick
         new_time = current_time + (1.0 / FPS) * st.session_state.past_race_speed
         
         if new_time >= max_time:
             st.session_state.past_race_playing = False
             st.session_state.past_race_time = max_time
+            st.rerun(scope="app")  # Re-register the view without its timer
         else:
             st.session_state.past_race_time = new_time
+
+
+# ---------- MAIN PAGE ----------
+st.markdown("""
+<div style="text-align: center; padding: 20px 0;">
+    <h1 style="font-size: 2.5rem; margin: 0;">🏁 Past Races</h1>
+    <p style="color: #C5C6C7; margin-top: 10px;">
+        Replay historical races with full telemetry visualization
+    </p>
+</div>
+""", unsafe_allow_html=True)
+
+# ---------- SESSION SELECTION ----------
+st.markdown("---")
+
+col_year, col_race, col_session, col_load = st.columns([1, 2, 1, 1])
+
+with col_year:
+    # Available years (Dynamic based on current/simulated year)
+    current_year_val = get_current_year()
+    # Ensure at least 2025 is included if current year < 2025 (unlikely but safe)
+    max_year = max(current_year_val, 2025)
+    available_years = list(range(max_year, 2018, -1))
+    selected_year = st.selectbox("📅 Year", available_years, index=0)
+
+with col_race:
+    # Get races for selected year (cache key includes date for daily refresh)
+    schedule = get_event_schedule(selected_year, _cache_date=_today)
+    
+    if not schedule.empty:
+        # Create race options
+        rounds = schedule['RoundNumber'].astype(int)
+        labels = "R" + rounds.astype(str) + " - " + schedule['EventName']
+        race_options = dict(zip(labels, rounds.tolist()))
+        
+        selected_race_label = st.selectbox("🏎️ Race", list(race_options.keys()))
+        selected_round = race_options[selected_race_label]
+    else:
+        st.warning(f"No completed races found for {selected_year}. Select an earlier year.")
+        selected_round = None
+
+with col_session:
+    if selected_round is not None:
+        session_options = get_available_sessions(selected_year, selected_round)
+        selected_session = st.selectbox("📋 Session", session_options)
         
-        # Short sleep then rerun for animation
-        time.sleep(1.0 / FPS)
-        st.rerun()
+        session_map = {"Race": "R", "Sprint": "S", "Qualifying": "Q"}
+        session_code = session_map.get(selected_session, "R")
+    else:
+        st.selectbox("📋 Session", ["Race"], disabled=True)
+        selected_session = "Race"
+        session_code = "R"
+
+with col_load:
+    st.write("")  # Spacer
+    st.write("")  # Spacer
+    
+    load_button = st.button("🔄 Load Race", type="primary", width="stretch",
+                            disabled=(selected_round is None))
+
+# Check if we need to load new data
+if selected_round is not None:
+    # Key no longer depends on mode (always "full/cached")
+    current_key = f"{selected_year}_{selected_round}_{session_code}"
+    
+    if load_button or (st.session_state.past_race_key != current_key and st.session_state.past_race_data is None):
+        if load_button:
+            st.session_state.past_race_key = current_key
+            st.session_state.past_race_time = 0.0
+            st.session_state.past_race_playing = False
+            st.session_state.past_race_selected_driver = None
+            
+            import time as time_module
+            start_time = time_module.time()
+            
+            with st.spinner(f"Loading {selected_session} data..."):
+                try:
+                    # Always request full_mode=True (which now tries DB cache first)
+                    data = get_race_telemetry_frames(selected_year, selected_round, session_code, full_mode=True)
+                    st.session_state.past_race_data = data
+                    
+                    elapsed = time_module.time() - start_time
+                    
+                    # Determine source
+                    source = "Supabase Cache ⚡" if data.get('_from_cache') else "F1 API (Live Compute)"
+                    st.success(f"✅ Loaded {data['event_name']} via {source} in {elapsed:.1f}s")
+                    
+                except Exception as e:
+                    st.error(f"Failed to load race data: {e}")
+                    st.session_state.past_race_data = None
+
+
+# ---------- VISUALIZATION ----------
+race_data = st.session_state.past_race_data
+
+if race_data and race_data.get("frames"):
+    # Autoplay reruns the fragment every frame interval; paused, it only reruns on interaction
+    run_every = 1.0 / FPS if st.session_state.past_race_playing else None
+    st.fragment(replay_view, run_every=run_every)(race_data)
 
 else:
     # No data loaded
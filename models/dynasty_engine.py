@@ -498,8 +498,6 @@ class DynastyEngine:
         
         # 4. Monte Carlo Simulation
         # Simulate variations based on historical residuals and consistency consistency
-        sim_matrix = np.zeros((N_DRIVERS, N_DRIVERS))
-        
         # Random error sampling from historical residuals
         random_errors = np.random.choice(self.residuals, size=(N_DRIVERS, n_sims))
         
@@ -522,16 +520,13 @@ class DynastyEngine:
         is_dnf = np.random.random((N_DRIVERS, n_sims)) < dnf_probs[:, np.newaxis]
         simulated_ranks[is_dnf] = 999
         
-        # Aggregate Results
-        for s in range(n_sims):
-            col = simulated_ranks[:, s]
-            # argsort twice gives the rank if sorted
-            finishing_order = np.argsort(col)
-            
-            for rank, driver_idx in enumerate(finishing_order):
-                # If driver didn't DNF (rank < 900), record their position
-                if rank < N_DRIVERS and simulated_ranks[driver_idx, s] < 900:
-                    sim_matrix[driver_idx, rank] += 1
+        # Aggregate Results: rank every simulation at once; finishing_order[rank, sim] is a driver
+        finishing_order = np.argsort(simulated_ranks, axis=0)
+        # If driver didn't DNF (rank < 900), record their position
+        finished = np.take_along_axis(simulated_ranks, finishing_order, axis=0) < 900
+        ranks = np.broadcast_to(np.arange(N_DRIVERS)[:, np.newaxis], finishing_order.shape)
+        cells = finishing_order[finished] * N_DRIVERS + ranks[finished]
+        sim_matrix = np.bincount(cells, minlength=N_DRIVERS * N_DRIVERS).reshape(N_DRIVERS, N_DRIVERS)
                     
         probs = (sim_matrix / n_sims) * 100
         
@@ -3,18 +3,17 @@ import numpy as np
 import xgboost as xgb
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_absolute_error, mean_squared_error
-import joblib
-import os
 from models.feature_engineering import fetch_race_data, preprocess_features
+from models.simulation import load_lap_time_model
 from utils.db import get_supabase_client
 
 def evaluate():
     # Load Model
-    if not os.path.exists('models/saved/lap_time_model.pkl'):
+    try:
+        model = load_lap_time_model()
+    except FileNotFoundError:
         print("Model not found.")
         return
-
-    model = joblib.load('models/saved/lap_time_model.pkl')
     
     # Fetch Data (Same logic as train)
     supabase = get_supabase_client()
@@ -1,3 +1,5 @@
+import glob
+import os
 import pandas as pd
 import numpy as np
 import time
@@ -6,10 +8,32 @@ from utils.db import get_supabase_client
 
 logger = logging.getLogger(__name__)
 
+RACE_DATA_CACHE_DIR = "data/race_data_cache"
+
+def _race_cache_paths(race_id, updated_at):
+    """Local Parquet paths for a race's laps and weather, keyed by the race row's updated_at."""
+    stamp = pd.Timestamp(updated_at).value
+    prefix = os.path.join(RACE_DATA_CACHE_DIR, f"{race_id}_{stamp}")
+    return f"{prefix}_laps.parquet", f"{prefix}_weather.parquet"
+
+def _write_race_cache(race_id, paths, laps_df, weather_df):
+    """Replace any older cached copy of this race with the freshly fetched frames."""
+    try:
+        os.makedirs(RACE_DATA_CACHE_DIR, exist_ok=True)
+        for old_path in glob.glob(os.path.join(RACE_DATA_CACHE_DIR, f"{race_id}_*.parquet")):
+            os.remove(old_path)
+        laps_df.to_parquet(paths[0], index=False)
+        weather_df.to_parquet(paths[1], index=False)
+    except Exception as e:
+        logger.warning(f"Could not cache race data for race {race_id}: {e}")
+
 def fetch_race_data(race_id, max_retries=3, base_delay=2.0):
     """
     Fetch race data from Supabase with retry logic for transient network errors.
     
+    Ingested races are cached locally as Parquet and reused until the race row's
+    updated_at changes, so repeat training/evaluation runs skip the full table pulls.
+    
     Args:
         race_id: The race ID to fetch data for
         max_retries: Maximum number of retry attempts (default: 3)
@@ -24,6 +48,13 @@ def fetch_race_data(race_id, max_retries=3, base_delay=2.0):
         try:
             supabase = get_supabase_client()
             
+            # Cheap staleness check: updated_at is stamped when a race's ingestion completes
+            race_res = supabase.table('races').select('updated_at').eq('id', race_id).execute()
+            updated_at = race_res.data[0].get('updated_at') if race_res.data else None
+            cache_paths = _race_cache_paths(race_id, updated_at) if updated_at else None
+            if cache_paths and all(os.path.exists(path) for path in cache_paths):
+                return pd.read_parquet(cache_paths[0]), pd.read_parquet(cache_paths[1])
+            
             # Fetch Laps
             laps_res = supabase.table('laps').select('*').eq('race_id', race_id).execute()
             laps_df = pd.DataFrame(laps_res.data)
@@ -32,6 +63,9 @@ def fetch_race_data(race_id, max_retries=3, base_delay=2.0):
             weather_res = supabase.table('weather').select('*').eq('race_id', race_id).execute()
             weather_df = pd.DataFrame(weather_res.data)
             
+            if cache_paths and not laps_df.empty:
+                _write_race_cache(race_id, cache_paths, laps_df, weather_df)
+            
             return laps_df, weather_df
             
         except Exception as e:
@@ -88,21 +122,19 @@ def preprocess_features(laps_df, weather_df):
     
     # Convert Interval strings to seconds
     # New schema uses milliseconds - convert to seconds
-    def ms_to_seconds(x):
-        if x is None: return None
-        if isinstance(x, (int, float)):
-            return x / 1000.0
-        # Fallback for legacy interval strings
-        try:
-            return pd.to_timedelta(x).total_seconds()
-        except:
-            return None
+    def to_seconds(col):
+        # Numbers are milliseconds; anything else is a legacy interval string (unparseable -> NaN)
+        seconds = pd.to_numeric(col, errors='coerce') / 1000.0
+        legacy = seconds.isna() & col.notna()
+        if legacy.any():
+            seconds[legacy] = pd.to_timedelta(col[legacy], errors='coerce').dt.total_seconds()
+        return seconds
 
     # Handle both old interval format and new ms format
     if 'lap_time_ms' in df.columns:
-        df['lap_time_s'] = df['lap_time_ms'].apply(ms_to_seconds)
+        df['lap_time_s'] = to_seconds(df['lap_time_ms'])
     elif 'lap_time' in df.columns:
-        df['lap_time_s'] = df['lap_time'].apply(ms_to_seconds)
+        df['lap_time_s'] = to_seconds(df['lap_time'])
     else:
         df['lap_time_s'] = None
         
@@ -550,8 +550,6 @@ class HybridPredictor:
         # Monte Carlo Simulation
         print(f"\n   Running {n_sims:,} Monte Carlo simulations...")
         
-        results_matrix = np.zeros((n_drivers, n_drivers))
-        
         # Get driver characteristics for simulation
         reliabilities = []
         for abbr, team, grid, features, _, _ in driver_scores:
@@ -565,23 +563,21 @@ class HybridPredictor:
         if weather_forecast == 'Wet':
             dnf_base_prob *= 1.5
         
-        # Run simulations
-        for sim in range(n_sims):
-            # Add randomness to base positions
-            noise = np.random.normal(0, chaos_factor * 2, n_drivers)
-            sim_positions = base_positions + noise
-            
-            # Apply DNFs
-            dnf_mask = np.random.random(n_drivers) < dnf_base_prob
-            sim_positions[dnf_mask] = 999
-            
-            # Rank
-            final_positions = np.argsort(sim_positions)
-            
-            # Record results
-            for rank, driver_idx in enumerate(final_positions):
-                if sim_positions[driver_idx] < 900:  # Not DNF
-                    results_matrix[driver_idx, rank] += 1
+        # Run simulations: every simulation is independent, so draw them as one
+        # (n_sims, n_drivers) matrix and rank each row
+        sim_positions = base_positions + np.random.normal(0, chaos_factor * 2, (n_sims, n_drivers))
+        
+        # Apply DNFs
+        sim_positions[np.random.random((n_sims, n_drivers)) < dnf_base_prob] = 999
+        
+        # Rank: final_positions[sim, rank] is the driver finishing there
+        final_positions = np.argsort(sim_positions, axis=1)
+        finished = np.take_along_axis(sim_positions, final_positions, axis=1) < 900  # Not DNF
+        
+        # Record results as (driver, rank) counts
+        ranks = np.broadcast_to(np.arange(n_drivers), final_positions.shape)
+        cells = final_positions[finished] * n_drivers + ranks[finished]
+        results_matrix = np.bincount(cells, minlength=n_drivers * n_drivers).reshape(n_drivers, n_drivers)
         
         # Calculate probabilities
         probabilities = (results_matrix / n_sims) * 100
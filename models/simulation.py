@@ -1,38 +1,55 @@
+import os
 import numpy as np
 import pandas as pd
 import joblib
 import logging
+import xgboost as xgb
 from utils.db import get_supabase_client
-import streamlit as st
 
 logger = logging.getLogger(__name__)
 
+MODEL_PATH = 'models/saved/lap_time_model.ubj'
+LEGACY_MODEL_PATH = 'models/saved/lap_time_model.pkl'
+
+def load_lap_time_model(model_path=MODEL_PATH):
+    """Load the lap time regressor from XGBoost's native format, or a legacy joblib pickle."""
+    if model_path.endswith(('.ubj', '.json')):
+        if os.path.exists(model_path):
+            model = xgb.XGBRegressor()
+            model.load_model(model_path)
+            return model
+        # Models trained before the switch to the native format
+        model_path = LEGACY_MODEL_PATH
+    return joblib.load(model_path)
+
 class RaceSimulator:
-    def __init__(self, model_path='models/saved/lap_time_model.pkl'):
+    def __init__(self, model_path=MODEL_PATH):
         try:
-            self.model = joblib.load(model_path)
+            self.model = load_lap_time_model(model_path)
         except FileNotFoundError:
             self.model = None
             print(f"Model not found at {model_path}")
+        # Raw booster for inplace_predict (skips the sklearn wrapper and DMatrix build)
+        self.booster = self.model.get_booster() if hasattr(self.model, 'get_booster') else None
             
         self.supabase = get_supabase_client()
         
     def get_race_drivers(self, race_id):
         # Fetch drivers participating in a race
-        print(f"Fetching drivers for race {race_id}...")
+        logger.debug("Fetching drivers for race %s", race_id)
         res = self.supabase.table('laps').select('driver_id').eq('race_id', race_id).execute()
         driver_ids = list(set([r['driver_id'] for r in res.data]))
-        print(f"Found {len(driver_ids)} drivers in laps table.")
+        logger.debug("Found %d drivers in laps table", len(driver_ids))
         
         # Fallback for future races: Use drivers from the last completed race of the same season
         if not driver_ids:
-            print("Using fallback logic for drivers...")
+            logger.debug("Using fallback logic for drivers")
             # Get season of the requested race
             race_info = self.supabase.table('races').select('season_year, race_date').eq('id', race_id).single().execute()
             if race_info.data:
                 season = race_info.data['season_year']
                 date = race_info.data['race_date']
-                print(f"Race season: {season}, date: {date}")
+                logger.debug("Race season: %s, date: %s", season, date)
                 
                 # Find last race with data
                 last_race = self.supabase.table('races')\
@@ -46,24 +63,25 @@ class RaceSimulator:
                 
                 if last_race.data:
                     last_race_id = last_race.data[0]['id']
-                    print(f"Found last race: {last_race.data[0]['name']} ({last_race_id})")
+                    logger.debug("Found last race: %s (%s)", last_race.data[0]['name'], last_race_id)
                     res = self.supabase.table('laps').select('driver_id').eq('race_id', last_race_id).execute()
                     driver_ids = list(set([r['driver_id'] for r in res.data]))
-                    print(f"Found {len(driver_ids)} drivers in fallback race.")
+                    logger.debug("Found %d drivers in fallback race", len(driver_ids))
                 else:
-                    print("No previous race found in season.")
+                    logger.debug("No previous race found in season")
 
         # Final Fallback: Just get all drivers from the drivers table (Demo Mode)
         if not driver_ids:
-            print("⚠️ No drivers found in race data. Fetching ALL drivers for demo.")
+            logger.warning("No drivers found in race data. Fetching ALL drivers for demo.")
             res = self.supabase.table('drivers').select('id').limit(20).execute()
             driver_ids = [r['id'] for r in res.data]
 
         if not driver_ids:
-            print("No drivers found even in drivers table.")
+            logger.warning("No drivers found even in drivers table.")
             return pd.DataFrame()
             
-        drivers_res = self.supabase.table('drivers').select('*').in_('id', driver_ids).execute()
+        # Only what simulate_race reads
+        drivers_res = self.supabase.table('drivers').select('id, code').in_('id', driver_ids).execute()
         return pd.DataFrame(drivers_res.data)
         
     def get_recent_form(self, driver_ids, current_race_id):
@@ -201,92 +219,66 @@ class RaceSimulator:
         # --- 3. Run Simulation (Vectorized) ---
         model_features = self.model.feature_names_in_
         n_drivers = len(driver_ids)
+        laps = np.arange(1, total_laps + 1)
         
         driver_weights_arr = np.array([driver_weights.get(d, 1.0) for d in driver_ids])
+        consistencies_arr = np.array([0.5 - (form_scores.get(d, 0.5) * 0.3) for d in driver_ids])
+        grid_arr = np.array([grid_positions.get(d, 10) for d in driver_ids])
+        grid_penalties = (grid_arr - 1) * 0.5
         
-        consistencies = []
-        for d_id in driver_ids:
-            form = form_scores.get(d_id, 0.5)
-            consistencies.append(0.5 - (form * 0.3))
-        consistencies_arr = np.array(consistencies)
-        
-        grid_penalties = np.array([(grid_positions.get(d, 10) - 1) * 0.5 for d in driver_ids])
+        # Model inputs don't vary between simulations, so predict every (lap, driver) in one batch,
+        # filled in place into a single contiguous float32 matrix
+        feature_idx = {name: i for i, name in enumerate(model_features)}
+        X = np.zeros((total_laps * n_drivers, len(model_features)), dtype=np.float32)
+        batch = {
+            'lap_number': np.repeat(laps, n_drivers),
+            'tyre_life': 10,
+            'fuel_load': np.repeat(110.0 * (1.0 - laps / total_laps), n_drivers),
+            'gap_to_leader': 0,
+            'position': np.tile(grid_arr, total_laps),
+            'tyre_SOFT': 1,
+        }
+        for col, values in batch.items():
+            if col in feature_idx:
+                X[:, feature_idx[col]] = values
+        if self.booster is not None:
+            predicted = self.booster.inplace_predict(X, validate_features=False)
+        else:
+            predicted = self.model.predict(pd.DataFrame(X, columns=model_features))
+        base_times = np.asarray(predicted).reshape(total_laps, n_drivers)
         
-        accumulated_times = np.zeros((n_simulations, n_drivers)) + grid_penalties
+        # Per-lap pit/pace penalties for each strategy (rows: 1-stop late, 2-stop, 2-stop long)
+        strategy_penalties = np.zeros((3, total_laps))
+        pit_laps = {0: (25,), 1: (15, 40), 2: (20, 45)}
+        stint_penalties = {0: (0.4, 0.8), 1: (0.0, 0.4, 0.4), 2: (0.4, 0.8, 0.4)}
+        for strat, pits in pit_laps.items():
+            bounds = (0,) + pits + (total_laps + 1,)
+            for (lo, hi), pen in zip(zip(bounds, bounds[1:]), stint_penalties[strat]):
+                strategy_penalties[strat, (laps > lo) & (laps < hi)] = pen
+            strategy_penalties[strat, np.isin(laps, pits)] = 22.0
         
         strategies = np.random.choice([0, 1, 2], size=(n_simulations, n_drivers), p=[0.6, 0.3, 0.1])
         
-        progress_bar = None
-        if 'streamlit' in str(type(st)):
-             progress_bar = st.progress(0)
-
-        for lap in range(1, total_laps + 1):
-            if progress_bar and lap % 5 == 0:
-                progress_bar.progress(lap / total_laps)
-            
-            fuel = 110.0 * (1.0 - (lap / total_laps))
-            
-            input_data = []
-            for d in driver_ids:
-                row = {
-                    'lap_number': lap,
-                    'tyre_life': 10,
-                    'fuel_load': fuel,
-                    'gap_to_leader': 0, 
-                    'position': grid_positions.get(d, 10),
-                    'tyre_HARD': 0, 'tyre_INTERMEDIATE': 0, 'tyre_MEDIUM': 0, 'tyre_SOFT': 1, 'tyre_WET': 0
-                }
-                input_data.append(row)
-            
-            input_df = pd.DataFrame(input_data)
-            for col in model_features:
-                if col not in input_df.columns: input_df[col] = 0
-            input_df = input_df[model_features]
-            
-            base_times = self.model.predict(input_df)
-            
-            step_times = np.tile(base_times, (n_simulations, 1))
-            
-            mask_s0 = (strategies == 0)
-            step_times[mask_s0 & (lap < 25)] += 0.4
-            step_times[mask_s0 & (lap == 25)] += 22.0
-            step_times[mask_s0 & (lap > 25)] += 0.8
-            
-            mask_s1 = (strategies == 1)
-            step_times[mask_s1 & (lap == 15)] += 22.0
-            step_times[mask_s1 & (lap > 15) & (lap < 40)] += 0.4
-            step_times[mask_s1 & (lap == 40)] += 22.0
-            step_times[mask_s1 & (lap > 40)] += 0.4
-            
-            mask_s2 = (strategies == 2)
-            step_times[mask_s2 & (lap < 20)] += 0.4
-            step_times[mask_s2 & (lap == 20)] += 22.0
-            step_times[mask_s2 & (lap > 20) & (lap < 45)] += 0.8
-            step_times[mask_s2 & (lap == 45)] += 22.0
-            step_times[mask_s2 & (lap > 45)] += 0.4
-
-            step_times *= driver_weights_arr
-            
-            noise = np.random.normal(0, consistencies_arr, size=(n_simulations, n_drivers))
-            
-            traffic_prob = 0.1
-            traffic_mask = np.random.random((n_simulations, n_drivers)) < traffic_prob
-            step_times[traffic_mask] += 0.5
-            
-            accumulated_times += step_times + noise
-            
-            dnf_prob = 0.0005
-            dnf_mask = np.random.random((n_simulations, n_drivers)) < dnf_prob
-            accumulated_times[dnf_mask] = np.inf
-            
-        positions = np.argsort(np.argsort(accumulated_times, axis=1), axis=1) + 1
+        # Every per-lap term is independent and additive, so the race total is drawn directly:
+        # weighted base + strategy laps, Binomial(laps, 0.1) traffic hits, Normal noise with
+        # sqrt(laps) spread, and a DNF if any lap's 0.05% retirement roll would have fired
+        # Terms are accumulated in place into one (sims, drivers) buffer, no full-size temporaries
+        race_base = base_times.sum(axis=0)
+        strategy_totals = strategy_penalties.sum(axis=1)
+        accumulated_times = strategy_totals[strategies]
+        accumulated_times += race_base
+        accumulated_times *= driver_weights_arr
+        accumulated_times += grid_penalties
+        accumulated_times += 0.5 * np.random.binomial(total_laps, 0.1, size=(n_simulations, n_drivers))
+        accumulated_times += np.random.normal(0, consistencies_arr * np.sqrt(total_laps), size=(n_simulations, n_drivers))
+        
+        dnf_prob = 1.0 - (1.0 - 0.0005) ** total_laps
+        accumulated_times[np.random.random((n_simulations, n_drivers)) < dnf_prob] = np.inf
         
-        results = []
-        for sim_idx in range(n_simulations):
-            sim_res = {}
-            for driver_idx, d_id in enumerate(driver_ids):
-                sim_res[d_id] = positions[sim_idx, driver_idx]
-            results.append(sim_res)
+        # Finishing position of each driver: scatter 1..n through the sort order (no second argsort)
+        positions = np.empty((n_simulations, n_drivers), dtype=np.int64)
+        np.put_along_axis(positions, np.argsort(accumulated_times, axis=1), np.arange(1, n_drivers + 1), axis=1)
+        results = [dict(zip(driver_ids, row)) for row in positions.tolist()]
             
         return results, driver_codes
 
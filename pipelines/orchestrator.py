@@ -29,6 +29,7 @@ configure_fastf1_retries()
 supabase = get_supabase_client()
 
 def run_pipeline():
+    """Run one pass of the pipeline. Returns True if new data was ingested."""
     logger.info("🚀 Starting Pipeline Execution...")
     
     try:
@@ -38,7 +39,7 @@ def run_pipeline():
         
         if not latest_session:
             logger.info("No completed sessions found.")
-            return
+            return False
 
         year = latest_session['Year']
         round_num = latest_session['Round']
@@ -75,7 +76,7 @@ def run_pipeline():
         
         if action == 'NONE':
             logger.info("System up to date. Exiting.")
-            return
+            return False
 
         # --- STEP 2: INGESTION ---
         logger.info("[Step 2/4] Running Ingestion...")
@@ -108,6 +109,7 @@ def run_pipeline():
              logger.info("[Step 4/4] Skipping Model Retraining (only Quali update).")
 
         logger.info("✅ Pipeline Execution Complete via Orchestrator.")
+        return True
 
     except Exception as e:
         logger.error(f"Pipeline Failed: {e}")
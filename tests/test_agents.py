@@ -0,0 +1,274 @@
+
+import json
+import pytest
+
+# --- Tests for the Status Store ---
+
+@pytest.fixture
+def status_store(tmp_path, monkeypatch):
+    from agents import status_store
+    monkeypatch.setattr(status_store, "STATUS_DIR", str(tmp_path / "agent_status"))
+    monkeypatch.setattr(status_store, "_STATE", {})
+    monkeypatch.setattr(status_store, "_dirty", set())
+    monkeypatch.setattr(status_store, "_pending_beats", {})
+    monkeypatch.setattr(status_store, "_lock_fd", None)
+    return status_store
+
+def test_status_store_flush_writes_one_file_per_agent(status_store):
+    """Flushing writes each agent to its own file with an ISO heartbeat."""
+    status_store.update("DataAgent", "active", 3600, {"rows": 10})
+    status_store.update("ModelAgent", "running", 86400)
+    status_store.flush()
+
+    data = status_store.load_all_statuses()
+    assert sorted(data) == ["DataAgent", "ModelAgent"]
+    assert data["DataAgent"]["state"] == "active"
+    assert data["DataAgent"]["interval"] == 3600
+    assert data["DataAgent"]["details"] == {"rows": 10}
+    assert "T" in data["DataAgent"]["last_heartbeat"]
+
+def test_status_store_update_overwrites(status_store):
+    """Later updates for the same agent replace the earlier entry."""
+    status_store.update("ModelAgent", "running", 60)
+    status_store.update("ModelAgent", "stopped", 60)
+    status_store.flush()
+
+    data = status_store.load_all_statuses()
+    assert list(data) == ["ModelAgent"]
+    assert data["ModelAgent"]["state"] == "stopped"
+
+def test_status_store_json_fallback(status_store, monkeypatch):
+    """Without orjson the store still writes compact JSON via the stdlib."""
+    monkeypatch.setattr(status_store, "orjson", None)
+
+    status_store.update("StrategyAgent", "active", 600)
+    status_store.flush()
+
+    path = f"{status_store.STATUS_DIR}/StrategyAgent.json"
+    raw = open(path).read()
+    assert " " not in raw
+    assert json.loads(raw)["state"] == "active"
+
+def test_status_store_skips_heartbeat_only_flushes(status_store):
+    """Due-only flushes write real changes and batch identical heartbeats."""
+    status_store.update("DataAgent", "active", 3600)
+    status_store.update("ModelAgent", "active", 86400)
+    assert sorted(status_store._take_snapshot(due_only=True)) == ["DataAgent", "ModelAgent"]
+    assert status_store._take_snapshot(due_only=True) == {}
+
+    for _ in range(status_store.HEARTBEAT_WRITE_EVERY - 1):
+        status_store.update("DataAgent", "active", 3600)
+    assert status_store._take_snapshot(due_only=True) == {}
+    status_store.update("DataAgent", "active", 3600)
+    status_store.update("ModelAgent", "error", 86400, {"last_error": "boom"})
+    assert sorted(status_store._take_snapshot(due_only=True)) == ["DataAgent", "ModelAgent"]
+
+# --- Tests for BaseAgent ---
+
+def test_orchestrator_runs_agents_on_shared_scheduler(monkeypatch):
+    import threading
+    import time
+    from agents import status_store
+    from agents.base import BaseAgent
+    from agents.orchestrator import AgentOrchestrator
+    """Agents run repeatedly from the pool without owning a thread each."""
+    monkeypatch.setattr(status_store, "flush", lambda: None)
+    monkeypatch.setattr(status_store, "start_flusher", lambda: None)
+
+    class CountingAgent(BaseAgent):
+        def __init__(self):
+            super().__init__("CountingAgent", interval=0.05)
+            self.runs = 0
+
+        def perform_task(self):
+            self.runs += 1
+
+    agent = CountingAgent()
+    orch = AgentOrchestrator(max_workers=1)
+    orch.register_agent(agent)
+    agent.start()
+    orch.schedule(agent)
+    threading.Thread(target=orch._run_scheduler, daemon=True).start()
+    time.sleep(0.3)
+
+    with pytest.raises(SystemExit):
+        orch.stop_all()
+    runs = agent.runs
+    time.sleep(0.15)
+
+    assert runs >= 3
+    assert agent.runs == runs  # Nothing runs after shutdown
+    assert not hasattr(agent, "thread")
+
+def test_agent_idle_ladder_backs_off_and_resets():
+    from agents.base import BaseAgent
+    """Unchanged ticks climb the ladder; events halve the position."""
+
+    class IdleAgent(BaseAgent):
+        def perform_task(self):
+            return False
+
+    agent = IdleAgent("LadderAgent", interval=10)
+    assert agent._next_interval(False) == 20
+    assert agent._next_interval(False) == 60
+    assert agent._next_interval(False) == 120
+    assert agent._next_interval(False) == 360
+    assert agent._next_interval(False) == 360  # Capped at the top of the ladder
+
+    agent._reset_idle()
+    assert agent._idle_idx == 2
+    assert agent._next_interval(None) == 10
+
+def test_reschedule_before_first_dispatch_keeps_first_run():
+    from agents.base import BaseAgent
+    from agents.orchestrator import AgentOrchestrator
+    """An event arriving before an agent's first run leaves that run queued."""
+
+    class IdleAgent(BaseAgent):
+        def perform_task(self):
+            return False
+
+    agent = IdleAgent("EarlyEventAgent", interval=3600)
+    orch = AgentOrchestrator(max_workers=1)
+    orch.register_agent(agent)
+    orch.schedule(agent)
+    first_run = orch._pending[agent.name]
+
+    agent._reset_idle()
+
+    assert orch._pending[agent.name] is first_run
+
+# --- Tests for the Message Bus ---
+
+def test_bus_runs_handlers_off_publisher_thread():
+    import threading
+    from agents.message_bus import bus
+    """Async handlers run on the pool; sync handlers run inline."""
+    seen = {}
+    done = threading.Event()
+
+    def async_handler(message):
+        seen["async"] = threading.current_thread().name
+        done.set()
+
+    def sync_handler(message):
+        seen["sync"] = threading.current_thread().name
+
+    bus.subscribe("test_thread_topic", async_handler)
+    bus.subscribe("test_thread_topic", sync_handler, sync=True)
+    bus.publish("test_thread_topic", {})
+
+    assert done.wait(2)
+    assert seen["sync"] == threading.current_thread().name
+    assert seen["async"].startswith("bus")
+
+def test_bus_freeze_rejects_new_subscribers():
+    from agents.message_bus import MessageBus
+    """After freeze() topics resolve to tuples and subscribe() is refused."""
+    bus = MessageBus()
+    received = []
+    bus.subscribe("test_freeze_topic", received.append, sync=True)
+
+    bus.freeze()
+    bus.publish("test_freeze_topic", "msg")
+    bus.publish("test_unknown_topic", "msg")
+
+    assert received == ["msg"]
+    assert isinstance(bus.subscribers["test_freeze_topic"], tuple)
+    with pytest.raises(RuntimeError):
+        bus.subscribe("test_freeze_topic", received.append)
+
+def test_bus_publish_skips_log_records_when_debug_disabled(monkeypatch):
+    import logging
+    from agents.message_bus import bus, logger
+    """Disabled debug logging returns before any record is built."""
+
+    def fail(*args, **kwargs):
+        raise AssertionError("log record was built")
+
+    assert not logger.isEnabledFor(logging.DEBUG)
+    monkeypatch.setattr(logger, "makeRecord", fail)
+    bus.publish("test_unsubscribed_topic", {"insight": "x" * 1000})
+
+def test_bus_drops_handlers_queued_past_timeout():
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from agents.message_bus import MessageBus
+    """A handler stuck behind a slow subscriber is cancelled once it times out."""
+    bus = MessageBus()
+    bus._pool = ThreadPoolExecutor(max_workers=1)
+    release = threading.Event()
+    ran = []
+
+    bus.subscribe("test_timeout_topic", lambda message: release.wait(5), timeout=0.1)
+    bus.subscribe("test_timeout_topic", ran.append, timeout=0.1)
+    bus.publish("test_timeout_topic", "msg")
+
+    time.sleep(2.5)  # Let the reaper pass over the expired entries
+    release.set()
+    bus._pool.shutdown(wait=True)
+
+    assert ran == []
+
+def test_bus_reaper_runs_only_while_tracking():
+    from agents.message_bus import MessageBus
+    """The reaper starts with the first timed handler and exits once it has none."""
+    bus = MessageBus()
+    assert bus._reaper is None
+
+    bus.subscribe("test_reaper_topic", lambda message: None, timeout=0.1)
+    bus.publish("test_reaper_topic", "msg")
+    reaper = bus._reaper
+    assert reaper is not None
+
+    reaper.join(2)
+    assert not reaper.is_alive()
+    assert bus._reaper is None
+
+def test_bus_coalesces_duplicate_bursts():
+    from agents.message_bus import MessageBus
+    """Identical payloads on a topic within the window are delivered once."""
+    bus = MessageBus()
+    received = []
+    bus.subscribe("test_coalesce_topic", received.append, sync=True)
+
+    bus.publish("test_coalesce_topic", {"status": "success"})
+    bus.publish("test_coalesce_topic", {"status": "success"})
+    bus.publish("test_coalesce_topic", {"status": "failed"})
+
+    assert received == [{"status": "success"}, {"status": "failed"}]
+
+# --- Tests for the Orchestrator ---
+
+def test_orchestrator_shuts_down_on_signal(monkeypatch):
+    import os
+    import signal
+    import threading
+    from agents import status_store
+    from agents.base import BaseAgent
+    from agents.message_bus import bus
+    from agents.orchestrator import AgentOrchestrator
+    """start_all() blocks until SIGTERM, then stops every agent."""
+    monkeypatch.setattr(status_store, "flush", lambda: None)
+    monkeypatch.setattr(status_store, "start_flusher", lambda: None)
+    monkeypatch.setattr(bus, "subscribers", bus.subscribers)
+    monkeypatch.setattr(bus, "_frozen", False)
+    previous = {sig: signal.getsignal(sig) for sig in (signal.SIGINT, signal.SIGTERM)}
+
+    class IdleAgent(BaseAgent):
+        def perform_task(self):
+            return False
+
+    agent = IdleAgent("SignalAgent", interval=3600)
+    orch = AgentOrchestrator()
+    orch.register_agent(agent)
+    threading.Timer(0.2, os.kill, (os.getpid(), signal.SIGTERM)).start()
+    try:
+        with pytest.raises(SystemExit):
+            orch.start_all()
+    finally:
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
+
+    assert not agent.running
@@ -2,8 +2,11 @@ import os
 import google.generativeai as genai
 from utils.db import get_supabase_client
 from utils.config import get_secret
+from utils.logger import get_logger
 import pandas as pd
 
+logger = get_logger(__name__)
+
 # Configure Gemini
 api_key = get_secret("GOOGLE_API_KEY")
 if api_key:
@@ -98,13 +101,15 @@ class RaceEngineer:
         except Exception as e:
             return f"Commentary analysis failed: {e}"
 
-    def ask(self, user_query):
+    def _unavailable_message(self):
         if not api_key:
             return "⚠️ AI Configuration Error: GOOGLE_API_KEY not found."
         
         if not self.available:
             return "⚠️ AI Service Unavailable: Could not initialize model (Check API Key/Model Access)."
+        return None
 
+    def _build_answer_prompt(self, user_query):
         # 1. Try to generate SQL
         sql = self.generate_sql(user_query)
         
@@ -139,24 +144,42 @@ class RaceEngineer:
         
         Response:
         """
+        return prompt
+
+    def ask(self, user_query):
+        unavailable = self._unavailable_message()
+        if unavailable:
+            return unavailable
+
+        prompt = self._build_answer_prompt(user_query)
         try:
             response = self.chat.send_message(prompt)
             return response.text
         except Exception as e:
             return f"AI Error: {str(e)}"
 
-def get_ai_insight(context_text):
+    def ask_stream(self, user_query):
+        """Like ask(), but yields the answer in chunks as the model produces them."""
+        unavailable = self._unavailable_message()
+        if unavailable:
+            yield unavailable
+            return
+
+        prompt = self._build_answer_prompt(user_query)
+        try:
+            for chunk in self.chat.send_message(prompt, stream=True):
+                yield chunk.text
+        except Exception as e:
+            yield f"AI Error: {str(e)}"
+
+_insight_model = None
+
+def build_insight_prompt(context_text):
     """
-    Generates a strategic insight based on the provided race context.
+    Renders the strategy-insight prompt for the given race context.
+    Callers with a fixed context can build this once and reuse it.
     """
-    if not api_key:
-        return "⚠️ AI Configuration Error: GOOGLE_API_KEY not found in .env"
-
-    try:
-        # Using Gemini 2.5 Flash for faster insights
-        model = genai.GenerativeModel('gemini-2.0-flash-exp')
-        
-        prompt = f"""
+    return f"""
         You are an expert Formula 1 Race Strategy Engineer.
         Analyze the following race data and provide a concise, actionable strategic insight.
         Focus on: Undercut opportunities, tyre degradation risks, and pace comparison.
@@ -165,9 +188,36 @@ def get_ai_insight(context_text):
         Race Data Context:
         {context_text}
         """
+
+def get_ai_insight_from_prompt(prompt):
+    """
+    Generates a strategic insight from a prompt built by build_insight_prompt().
+    Returns None when the AI is unconfigured or the request fails.
+    """
+    global _insight_model
+    if not api_key:
+        logger.warning("AI insight skipped: GOOGLE_API_KEY not found in .env")
+        return None
+
+    try:
+        # Using Gemini 2.5 Flash for faster insights
+        if _insight_model is None:
+            _insight_model = genai.GenerativeModel('gemini-2.0-flash-exp')
         
-        response = model.generate_content(prompt)
+        response = _insight_model.generate_content(prompt)
         return response.text
     except Exception as e:
-        return f"AI Insight Unavailable: {str(e)}"
+        logger.exception("AI insight request failed: %s", e)
+        return None
+
+def get_ai_insight(context_text):
+    """
+    Generates a strategic insight based on the provided race context.
+    """
+    insight = get_ai_insight_from_prompt(build_insight_prompt(context_text))
+    if insight is not None:
+        return insight
+    if not api_key:
+        return "⚠️ AI Configuration Error: GOOGLE_API_KEY not found in .env"
+    return "AI Insight Unavailable. Please try again later."
 
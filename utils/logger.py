@@ -113,6 +113,10 @@ class ContextLogger(logging.Logger):
     
     def _log_with_extra(self, level: int, msg: str, args, exc_info=None, extra=None, **kwargs):
         """Log with extra data merged."""
+        # The level methods below bypass Logger's own check, so filter here
+        # before building the record or the extra payload.
+        if not self.isEnabledFor(level):
+            return
         extra = extra or {}
         extra['extra_data'] = {**self._context, **kwargs}
         super()._log(level, msg, args, exc_info=exc_info, extra=extra)
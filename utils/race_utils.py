@@ -3,15 +3,14 @@ import pandas as pd
 from datetime import datetime, timezone
 import streamlit as st
 from utils.db import get_supabase_client
-import matplotlib.pyplot as plt
-import io
+import numpy as np
 import base64
+import hashlib
+import json
+import os
+import time
 
-import requests
-from requests.adapters import HTTPAdapter
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-from utils.time_simulation import get_current_time
+from utils.time_simulation import get_current_time, to_utc
 
 # Initialize Supabase
 supabase = get_supabase_client()
@@ -20,17 +19,182 @@ supabase = get_supabase_client()
 from utils.api_config import configure_fastf1_retries
 configure_fastf1_retries()
 
-@st.cache_data(ttl=86400)  # Cache for 24 hours
-def get_track_map_image(_event):
+SCHEDULE_CACHE_DIR = os.path.join('f1_cache', 'schedules')
+SCHEDULE_DATE_COLS = ('EventDate', 'Session1Date', 'Session2Date', 'Session3Date', 'Session4Date', 'Session5Date')
+
+
+def ensure_utc(schedule):
+    """Coerce the schedule's date columns to UTC-aware datetimes in place; returns the schedule."""
+    for col in SCHEDULE_DATE_COLS:
+        if col in schedule.columns:
+            values = schedule[col]
+            converted = to_utc(values)
+            if converted is not values:  # Already-UTC columns are left alone
+                schedule[col] = converted
+    return schedule
+
+
+def first_event_after(schedule, cutoff):
+    """Row position of the first event whose EventDate is after cutoff (len(schedule) if none).
+
+    Expects a UTC schedule in round order, so EventDate is sorted and a binary search
+    over its int64 view replaces a full boolean mask.
+    """
+    dates = schedule['EventDate'].array
+    cutoff_utc = pd.Timestamp(cutoff).tz_convert('UTC').tz_localize(None)
+    cutoff_i8 = np.datetime64(cutoff_utc, dates.unit).astype(np.int64)  # Same unit as the column
+    return int(np.searchsorted(dates.asi8, cutoff_i8, side='right'))
+
+
+CURRENT_SCHEDULE_TTL = 300  # seconds; the current/next season can still be revised
+
+
+def _disk_schedule(year, max_age=None):
+    """Fetch a season schedule through a pickle under SCHEDULE_CACHE_DIR (max_age None = never stale)."""
+    path = os.path.join(SCHEDULE_CACHE_DIR, f"{year}.pkl")
+    try:
+        if max_age is None or time.time() - os.path.getmtime(path) < max_age:
+            return pd.read_pickle(path)
+    except Exception:
+        pass
+    schedule = fastf1.get_event_schedule(year)
+    try:
+        os.makedirs(SCHEDULE_CACHE_DIR, exist_ok=True)
+        tmp_path = path + ".tmp"
+        schedule.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"⚠ Could not cache {year} schedule: {e}")
+    return schedule
+
+
+@st.cache_data(ttl=30 * 86400, show_spinner=False)  # Past seasons never change
+def _past_schedule(year):
+    return _disk_schedule(year)
+
+
+@st.cache_data(ttl=CURRENT_SCHEDULE_TTL, show_spinner=False)
+def _current_schedule(year):
+    return _disk_schedule(year, max_age=CURRENT_SCHEDULE_TTL)
+
+
+def get_schedule_for_year(year):
+    """FastF1 event schedule for a season, cached in-process and on disk across restarts."""
+    if year < get_current_time().year:
+        return _past_schedule(year)
+    return _current_schedule(year)
+
+
+NEXT_SEASON_MISS_FILE = os.path.join('f1_cache', 'next_year_miss.json')
+NEXT_SEASON_MISS_TTL = 6 * 3600  # Don't re-ask for an unpublished season more often than this
+
+
+def _next_season_miss_until(year):
+    try:
+        with open(NEXT_SEASON_MISS_FILE) as f:
+            miss = json.load(f)
+        return miss["until"] if miss.get("year") == year else 0
+    except (OSError, ValueError, KeyError):
+        return 0
+
+
+def get_next_season_schedule(year):
+    """
+    Schedule for a season that may not be published yet, or None if it isn't.
+    A miss is remembered on disk so the off-season doesn't re-query on every page load.
+    """
+    if time.time() < _next_season_miss_until(year):
+        return None
+    try:
+        schedule = get_schedule_for_year(year)
+    except Exception as e:
+        print(f"⚠ {year} schedule lookup failed: {e}")
+        schedule = None
+    if schedule is not None and not schedule.empty:
+        return schedule
+    
+    try:
+        os.makedirs(os.path.dirname(NEXT_SEASON_MISS_FILE), exist_ok=True)
+        with open(NEXT_SEASON_MISS_FILE, 'w') as f:
+            json.dump({"year": year, "until": time.time() + NEXT_SEASON_MISS_TTL}, f)
+    except OSError as e:
+        print(f"⚠ Could not record {year} schedule miss: {e}")
+    return None
+
+
+TRACK_MAP_CACHE_DIR = os.path.join('f1_cache', 'trackmaps')
+TRACK_MAP_MAX_AGE = 30 * 86400  # Track layouts rarely change; re-render monthly at most
+TRACK_MAP_POINT_STRIDE = 5
+
+
+def _track_map_cache_path(location, country):
+    key = hashlib.sha1(f"{location}|{country}".encode('utf-8')).hexdigest()
+    return os.path.join(TRACK_MAP_CACHE_DIR, f"{key}.svg")
+
+
+def _svg_data_uri(svg_bytes):
+    return f"data:image/svg+xml;base64,{base64.b64encode(svg_bytes).decode('utf-8')}"
+
+
+def _track_svg(xs, ys):
+    """Render an X/Y trace as a bare SVG polyline (y flipped to screen space)."""
+    ys = -ys
+    pad = 0.03 * max(np.ptp(xs), np.ptp(ys))
+    x0, y0 = xs.min() - pad, ys.min() - pad
+    width, height = np.ptp(xs) + 2 * pad, np.ptp(ys) + 2 * pad
+    d = "M " + " L ".join(f"{x:.1f},{y:.1f}" for x, y in zip(xs, ys))
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="{x0:.1f} {y0:.1f} {width:.1f} {height:.1f}">'
+        f'<path d="{d}" stroke="#FF1801" stroke-width="2.5" vector-effect="non-scaling-stroke" '
+        f'stroke-linejoin="round" fill="none"/></svg>'
+    ).encode('utf-8')
+
+
+def _read_cached_track_map(location, country):
+    """Return the cached SVG data URI for a circuit, or None if missing/stale."""
+    path = _track_map_cache_path(location, country)
+    try:
+        if time.time() - os.path.getmtime(path) < TRACK_MAP_MAX_AGE:
+            with open(path, 'rb') as f:
+                return _svg_data_uri(f.read())
+    except OSError:
+        pass
+    return None
+
+
+def _write_cached_track_map(location, country, svg_bytes):
+    try:
+        os.makedirs(TRACK_MAP_CACHE_DIR, exist_ok=True)
+        path = _track_map_cache_path(location, country)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(svg_bytes)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"⚠ Could not cache track map: {e}")
+
+
+def get_track_map_image(event):
+    """
+    Generate a track map image for the given event (a schedule row as a Series or dict).
+    Cached on the event's scalar fields, so callers never pay for hashing the row.
+    """
+    try:
+        return _track_map_image(
+            event['Location'], event['Country'], event['EventName'],
+            int(event['EventDate'].year), int(event.get('RoundNumber', 1))
+        )
+    except Exception as e:
+        print(f"❌ Error generating track map: {e}")
+        return None
+
+
+@st.cache_data(ttl=86400, show_spinner=False)  # In-process L1; the SVG file cache is the L2 across restarts
+def _track_map_image(event_location, event_country, event_name, event_year, round_number):
     """
-    Generate a track map image for the given event.
-    Tries multiple years to find telemetry data.
-    Note: _event uses underscore prefix to prevent Streamlit from hashing it for caching.
+    Tries multiple years to find telemetry data for the circuit.
     """
     try:
-        event_location = _event['Location']
-        event_country = _event['Country']
-        event_name = _event['EventName']
         
         # Pre-season testing circuit mapping (year -> (location, country))
         TESTING_CIRCUITS = {
@@ -42,10 +206,9 @@ def get_track_map_image(_event):
         }
         
         # Handle testing events - use mapped circuit instead of skipping
-        is_testing = 'Testing' in str(event_name) or 'Test' in str(event_name) or _event.get('RoundNumber', 1) == 0
+        is_testing = 'Testing' in str(event_name) or 'Test' in str(event_name) or round_number == 0
         
         if is_testing:
-            event_year = _event['EventDate'].year
             if event_year in TESTING_CIRCUITS:
                 event_location, event_country = TESTING_CIRCUITS[event_year]
                 print(f"🧪 Pre-season testing: Using {event_location}, {event_country} for track map")
@@ -53,7 +216,9 @@ def get_track_map_image(_event):
                 print(f"⚠ Skipping track map for testing event: {event_name} (no circuit mapping)")
                 return None
         
-        event_year = _event['EventDate'].year
+        cached = _read_cached_track_map(event_location, event_country)
+        if cached:
+            return cached
         
         # Try multiple years: current year first, then previous years
         years_to_try = [event_year, event_year - 1, event_year - 2, 2024, 2023]
@@ -65,7 +230,7 @@ def get_track_map_image(_event):
                 print(f"🔍 Attempting to load track map for {event_location} from {year}...")
                 
                 # Get schedule for this year
-                schedule_year = fastf1.get_event_schedule(year)
+                schedule_year = get_schedule_for_year(year)
                 
                 # Filter out testing events (round 0)
                 schedule_year = schedule_year[schedule_year['RoundNumber'] > 0]
@@ -91,30 +256,22 @@ def get_track_map_image(_event):
                 for session_type in ['Q', 'R']:
                     try:
                         session = fastf1.get_session(year, round_num, session_type)
+                        # Position data arrives as one stream for all drivers, so telemetry
+                        # still has to load; only the outline of one lap is used from it
                         session.load(laps=True, telemetry=True, weather=False, messages=False)
                         
-                        # Get fastest lap telemetry
+                        # Get fastest lap position trace (no car-data merge or distance columns)
                         lap = session.laps.pick_fastest()
                         if lap is not None and not getattr(lap, 'empty', True):
-                            pos = lap.get_telemetry()
+                            pos = lap.get_pos_data()
                             if pos is not None and not pos.empty and 'X' in pos.columns and 'Y' in pos.columns:
-                                pos = pos.add_distance().add_relative_distance()
-                                
-                                # Create the plot
-                                fig, ax = plt.subplots(figsize=(5, 3), facecolor='none')
-                                ax.plot(pos['X'], pos['Y'], color='#FF1801', linewidth=2.5)
-                                ax.axis('off')
-                                ax.set_aspect('equal')
+                                pos = pos.iloc[::TRACK_MAP_POINT_STRIDE]  # An outline needs a few hundred points
                                 
-                                # Save to buffer
-                                buf = io.BytesIO()
-                                fig.savefig(buf, format='svg', bbox_inches='tight', transparent=True)
-                                buf.seek(0)
-                                img_str = base64.b64encode(buf.getvalue()).decode('utf-8')
-                                plt.close(fig)
+                                svg_bytes = _track_svg(pos['X'].to_numpy(), pos['Y'].to_numpy())
                                 
+                                _write_cached_track_map(event_location, event_country, svg_bytes)
                                 print(f"✓ Successfully loaded track map from {year} {session_type}")
-                                return f"data:image/svg+xml;base64,{img_str}"
+                                return _svg_data_uri(svg_bytes)
                     except Exception as sess_err:
                         print(f"  ⚠ {session_type} session failed: {sess_err}")
                         continue
@@ -250,10 +407,10 @@ def get_current_standings(year=None):
         
     try:
         # Get schedule
-        schedule = fastf1.get_event_schedule(year)
+        schedule = get_schedule_for_year(year)
         # Ensure EventDate is timezone-aware for comparison
         if 'EventDate' in schedule.columns:
-            schedule['EventDate'] = pd.to_datetime(schedule['EventDate'], utc=True)
+            schedule['EventDate'] = to_utc(schedule['EventDate'])
             
         completed = schedule[schedule['EventDate'] < get_current_time()]
         
@@ -341,10 +498,10 @@ def get_latest_completed_session():
         
         # Get schedule for current year
         try:
-            schedule = fastf1.get_event_schedule(year)
+            schedule = get_schedule_for_year(year)
         except Exception:
             # Fallback for year boundary issues
-            schedule = fastf1.get_event_schedule(year - 1)
+            schedule = get_schedule_for_year(year - 1)
             year = year - 1
         
         latest_session = None
@@ -404,7 +561,7 @@ def get_session_status(year, round_num):
     Returns a dict mapping session type to boolean (completed or not).
     """
     try:
-        schedule = fastf1.get_event_schedule(year)
+        schedule = get_schedule_for_year(year)
         event = schedule[schedule['RoundNumber'] == round_num]
         
         if event.empty:
@@ -9,11 +9,13 @@ This module provides two modes:
 2. FULL MODE: Uses complete telemetry - slower but accurate driver positions
 """
 
+import bisect
 import os
 import pickle
 import numpy as np
 import pandas as pd
 from datetime import timedelta
+from operator import itemgetter
 from typing import Dict, List, Optional, Tuple, Any
 from multiprocessing import Pool, cpu_count
 import fastf1
@@ -487,66 +489,59 @@ def _build_frames_fast_mode(session, drivers, driver_codes, laps, max_lap_number
     
     num_track_points = len(track_x)
     
+    # Convert every lap row once, column-wise, rather than per row inside the lap loop
+    drivers_col = laps['Driver'].replace('', np.nan).fillna(laps['DriverNumber'].map(driver_codes))
+    positions = laps['Position'].fillna(20).astype(int)
+    compounds = laps['Compound'].astype(str)
+    lap_times = laps['LapTime'].dt.total_seconds()
+    
+    # Calculate driver position on track based on race position
+    if num_track_points > 0:
+        spacing = 1.0 / 20
+        track_progress = np.clip(0.75 - (positions.to_numpy() - 1) * spacing, 0.05, 0.95)
+        track_idx = (track_progress * num_track_points).astype(int) % num_track_points
+        driver_x = np.asarray(track_x)[track_idx]
+        driver_y = np.asarray(track_y)[track_idx]
+        dist = track_progress * 100
+    else:
+        driver_x = driver_y = dist = np.zeros(len(laps), dtype=int)
+    
+    lap_rows = pd.DataFrame({
+        'code': drivers_col,
+        'position': positions,
+        'lap_number': laps['LapNumber'],
+        'raw_position': laps['Position'],
+        'tyre': compounds.map({c: get_tyre_compound_int(c) for c in compounds.unique()}),
+        'lap_time': lap_times.astype(object).where(lap_times.notna(), None),
+        'x': driver_x,
+        'y': driver_y,
+        'dist': dist,
+    }, index=laps.index)
+    lap_rows = lap_rows[lap_rows['code'].notna() & (lap_rows['code'] != '')]
+    
+    # Sort once by lap then position, so each lap is a contiguous group rather than a full scan
+    lap_rows = lap_rows[lap_rows['lap_number'].between(1, max_lap_number)]
+    lap_rows = lap_rows.sort_values(['lap_number', 'raw_position'], kind='stable')
+    
     # Build one frame per lap
     frames = []
     
-    for lap_num in range(1, max_lap_number + 1):
-        lap_data = laps[laps['LapNumber'] == lap_num].copy()
-        
-        if lap_data.empty:
-            continue
-        
-        # Sort by position
-        lap_data = lap_data.sort_values('Position')
-        
+    for lap_num, lap_data in lap_rows.groupby('lap_number', sort=False):
+        lap_num = int(lap_num)
         frame_drivers = {}
-        for _, lap in lap_data.iterrows():
-            try:
-                driver_abbr = lap.get('Driver') or driver_codes.get(lap.get('DriverNumber'))
-                if not driver_abbr:
-                    continue
-                
-                position = int(lap['Position']) if pd.notna(lap['Position']) else 20
-                
-                # Calculate driver position on track based on race position
-                if num_track_points > 0:
-                    spacing = 1.0 / 20
-                    track_progress = 0.75 - (position - 1) * spacing
-                    track_progress = max(0.05, min(0.95, track_progress))
-                    
-                    track_idx = int(track_progress * num_track_points) % num_track_points
-                    driver_x = track_x[track_idx]
-                    driver_y = track_y[track_idx]
-                else:
-                    driver_x = 0
-                    driver_y = 0
-                    track_progress = 0
-                
-                # Get tyre compound
-                compound = str(lap.get('Compound', 'UNKNOWN'))
-                tyre_int = get_tyre_compound_int(compound)
-                
-                # Get lap time
-                lap_time = lap.get('LapTime')
-                if pd.notna(lap_time):
-                    lap_time_secs = lap_time.total_seconds()
-                else:
-                    lap_time_secs = None
-                
-                frame_drivers[driver_abbr] = {
-                    'position': position,
-                    'lap': int(lap_num),
-                    'tyre': tyre_int,
-                    'lap_time': lap_time_secs,
-                    'x': driver_x,
-                    'y': driver_y,
-                    'speed': 0,
-                    'gear': 0,
-                    'drs': 0,
-                    'dist': track_progress * 100 if num_track_points > 0 else 0,
-                }
-            except Exception as e:
-                continue
+        for row in lap_data.to_dict('records'):
+            frame_drivers[row['code']] = {
+                'position': row['position'],
+                'lap': int(lap_num),
+                'tyre': row['tyre'],
+                'lap_time': row['lap_time'],
+                'x': row['x'],
+                'y': row['y'],
+                'speed': 0,
+                'gear': 0,
+                'drs': 0,
+                'dist': row['dist'],
+            }
         
         # Approximate time (90 seconds per lap average)
         approx_time = lap_num * 90.0
@@ -589,15 +584,13 @@ def _get_track_statuses(session) -> List[Dict]:
 
 
 def get_frame_at_time(frames: List[Dict], time_seconds: float) -> Optional[Dict]:
-    """Get the frame closest to the given time."""
+    """Get the first frame at or after the given time (frames are in time order)."""
     if not frames:
         return None
     
-    for frame in frames:
-        if frame["t"] >= time_seconds:
-            return frame
-    
-    return frames[-1]
+    # Binary search: playback looks a frame up on every tick
+    i = bisect.bisect_left(frames, time_seconds, key=itemgetter("t"))
+    return frames[min(i, len(frames) - 1)]
 
 
 def get_frame_at_lap(frames: List[Dict], lap: int) -> Optional[Dict]:
@@ -20,15 +20,15 @@ def generate_race_report(race_id, year, round_num, event_name):
         
     try:
         # 1. Fetch Race Stats
-        # Get Top 5 finishers
-        laps_res = supabase.table('laps').select('*').eq('race_id', race_id).order('lap_number', desc=True).limit(100).execute()
+        # Get Top 5 finishers (only counted, so just the ids)
+        laps_res = supabase.table('laps').select('id').eq('race_id', race_id).order('lap_number', desc=True).limit(100).execute()
         if not laps_res.data:
             return
 
         laps_df = pd.DataFrame(laps_res.data)
         
         # Get Pit Stops
-        pits_res = supabase.table('pit_stops').select('*').eq('race_id', race_id).execute()
+        pits_res = supabase.table('pit_stops').select('id').eq('race_id', race_id).execute()
         pits_df = pd.DataFrame(pits_res.data) if pits_res.data else pd.DataFrame()
         
         # Construct Context
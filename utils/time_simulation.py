@@ -18,7 +18,7 @@ Example:
 
 import os
 import datetime
-import pytz
+import pandas as pd
 import streamlit as st
 from typing import Optional
 
@@ -40,7 +40,7 @@ def get_simulated_date() -> Optional[datetime.datetime]:
         
         # Ensure timezone aware
         if dt.tzinfo is None:
-            dt = pytz.utc.localize(dt)
+            dt = dt.replace(tzinfo=datetime.timezone.utc)
         
         return dt
     except Exception as e:
@@ -60,7 +60,7 @@ def get_current_time() -> datetime.datetime:
         if simulated:
             return simulated
     
-    return datetime.datetime.now(pytz.utc)
+    return datetime.datetime.now(datetime.timezone.utc)
 
 
 def get_current_year() -> int:
@@ -68,6 +68,14 @@ def get_current_year() -> int:
     return get_current_time().year
 
 
+def to_utc(values: pd.Series) -> pd.Series:
+    """Datetimes as UTC-aware; a column that is already UTC is returned unchanged."""
+    dtype = values.dtype
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        return values if str(dtype.tz) == 'UTC' else values.dt.tz_convert('UTC')
+    # Naive or mixed-offset object columns: the slow parse path, with repeated values deduped
+    return pd.to_datetime(values, utc=True, cache=True)
+
 
 
 def get_race_weekend_status(race_date: datetime.datetime, 
@@ -85,12 +93,12 @@ def get_race_weekend_status(race_date: datetime.datetime,
     
     # Ensure race_date is timezone-aware
     if race_date.tzinfo is None:
-        race_date = pytz.utc.localize(race_date)
+        race_date = race_date.replace(tzinfo=datetime.timezone.utc)
     
     # If session_5_date (race time) is provided, use it
     if session_5_date is not None:
         if session_5_date.tzinfo is None:
-            session_5_date = pytz.utc.localize(session_5_date)
+            session_5_date = session_5_date.replace(tzinfo=datetime.timezone.utc)
         
         # Race is "live" from Session5Date to Session5Date + 3 hours
         race_end_estimate = session_5_date + datetime.timedelta(hours=3)